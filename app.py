@@ -33,7 +33,7 @@ import utils.protein_database as pdb
 
 # --- Import your existing functions ---
 # You'll need to make them importable, e.g., from runner import run_pipeline
-from runner import run_full_job, run_requery_job
+from runner import run_full_job, run_requery_job, configure_logging
 from visualizer import create_visualization
 
 # --- App Setup ---
@@ -2011,4 +2011,5 @@ def chat():
 
 
 if __name__ == '__main__':
+    configure_logging()
     app.run(host='127.0.0.1', port=5001, debug=True, threaded=True, use_reloader=True)
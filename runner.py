@@ -9,7 +9,9 @@ UPDATED: Protein database integration for cross-query knowledge building
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import logging
 from copy import deepcopy
 import os
 import sys
@@ -27,6 +29,25 @@ if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
+# Re-query path logs via `logging` with lazy %-formatting. As a library
+# module runner leaves handlers and levels to the host application; the
+# command-line entry points call configure_logging().
+log = logging.getLogger(__name__)
+
+
+def configure_logging() -> None:
+    """Send log records to stderr at RUNNER_LOG_LEVEL (default INFO).
+
+    For entry points only (runner's and app.py's ``__main__``); an unknown
+    level name falls back to INFO rather than failing.
+    """
+    level = os.getenv("RUNNER_LOG_LEVEL", "INFO").upper()
+    logging.basicConfig(
+        stream=sys.stderr,
+        format="%(message)s",
+        level=level if isinstance(logging.getLevelName(level), int) else logging.INFO,
+    )
+
 import httpx
 from google.genai import types, errors as genai_errors
 
@@ -125,6 +146,8 @@ MIN_ALLOWED_THINKING_BUDGET = 1000
 
 CACHE_DIR = "cache"
 
+_BANNER = "=" * 60
+
 
 def _coerce_token_count(value: Any) -> int:
     """Safely convert token counters to ints, treating None/missing as 0."""
@@ -141,6 +164,10 @@ class PipelineError(RuntimeError):
     """Raised when a pipeline step fails validation or parsing."""
 
 
+class CancelledByUser(PipelineError):
+    """Raised when a job's cancel_event is set while the pipeline is running."""
+
+
 def ensure_env() -> None:
     """Load environment variables and verify the Google API key exists."""
     load_dotenv()
@@ -569,13 +596,13 @@ def call_gemini_model(step: StepConfig, prompt: str, cancel_event=None) -> tuple
             }
 
     Raises:
-        PipelineError: If cancellation is requested
+        CancelledByUser: If cancellation is requested
     """
     from google import genai as google_genai
 
     # Check for cancellation before making expensive API call
     if cancel_event and cancel_event.is_set():
-        raise PipelineError("Job cancelled by user")
+        raise CancelledByUser("Job cancelled by user")
 
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
@@ -1122,7 +1149,7 @@ def run_pipeline(
     for step_idx, step in enumerate(validated_steps, start=1):
         # Check for cancellation before each step
         if cancel_event and cancel_event.is_set():
-            raise PipelineError("Job cancelled by user")
+            raise CancelledByUser("Job cancelled by user")
 
         step_start_time = time_module.time()
 
@@ -1463,7 +1490,7 @@ def _run_main_pipeline_for_web(
     for step_idx, step in enumerate(validated_steps, start=1):
         # Check for cancellation before each step
         if cancel_event and cancel_event.is_set():
-            raise PipelineError("Job cancelled by user")
+            raise CancelledByUser("Job cancelled by user")
 
         # Report progress to the web UI with user-friendly name
         friendly_name = _get_user_friendly_step_name(step.name)
@@ -2273,31 +2300,188 @@ def run_full_job(
                 jobs[user_query]['status'] = 'complete'
                 jobs[user_query]['progress'] = 'Done'
 
+    except CancelledByUser:
+        print(f"PIPELINE CANCELLED for '{user_query}'", file=sys.stderr)
+        with lock:
+            # Only update if this is still our job (check cancel_event identity)
+            if user_query in jobs and jobs[user_query].get('cancel_event') is cancel_event:
+                jobs[user_query]['status'] = 'cancelled'
+                jobs[user_query]['progress'] = {"text": "Cancelled by user"}
+
     except Exception as e:
         error_message = f"Error: {str(e)}"
+        print(f"PIPELINE ERROR for '{user_query}': {error_message}", file=sys.stderr)
+        # Also print the full traceback for detailed debugging
+        import traceback
+        traceback.print_exc(file=sys.stderr)
 
-        # Check if this was a cancellation
-        is_cancelled = "cancelled by user" in error_message.lower()
+        with lock:
+            # Only update if this is still our job (check cancel_event identity)
+            if user_query in jobs and jobs[user_query].get('cancel_event') is cancel_event:
+                jobs[user_query]['status'] = 'error'
+                jobs[user_query]['progress'] = {"text": error_message}
+                print(f"Successfully updated jobs dictionary for '{user_query}' to error state.", file=sys.stderr)
 
-        if is_cancelled:
-            print(f"PIPELINE CANCELLED for '{user_query}'", file=sys.stderr)
-            with lock:
-                # Only update if this is still our job (check cancel_event identity)
-                if user_query in jobs and jobs[user_query].get('cancel_event') is cancel_event:
-                    jobs[user_query]['status'] = 'cancelled'
-                    jobs[user_query]['progress'] = {"text": "Cancelled by user"}
-        else:
-            print(f"PIPELINE ERROR for '{user_query}': {error_message}", file=sys.stderr)
-            # Also print the full traceback for detailed debugging
-            import traceback
-            traceback.print_exc(file=sys.stderr)
 
-            with lock:
-                # Only update if this is still our job (check cancel_event identity)
-                if user_query in jobs and jobs[user_query].get('cancel_event') is cancel_event:
-                    jobs[user_query]['status'] = 'error'
-                    jobs[user_query]['progress'] = {"text": error_message}
-                    print(f"Successfully updated jobs dictionary for '{user_query}' to error state.", file=sys.stderr)
+_INTERACTION_METADATA_FIELDS = ("arrow", "intent", "mechanism", "effect", "summary", "evidence")
+
+
+def _overlay_interaction_metadata(
+    pmid_payload: Dict[str, Any],
+    metadata_payload: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Copy synthesized interaction-level fields onto a PMID-updated payload.
+
+    The PMID updater only rewrites function-level evidence/pmids (and prunes
+    functions or interactors left without citations), while the metadata
+    generator only writes interaction-level fields. Overlaying the latter by
+    ``primary`` reproduces the result of running the two stages back to back.
+    """
+    for section in ("ctx_json", "snapshot_json"):
+        target = pmid_payload.get(section)
+        source = metadata_payload.get(section)
+        if not isinstance(target, dict) or not isinstance(source, dict):
+            continue
+
+        source_map = {i.get("primary"): i for i in source.get("interactors", []) if isinstance(i, dict)}
+        for interactor in target.get("interactors", []):
+            if not isinstance(interactor, dict):
+                continue
+            synthesized = source_map.get(interactor.get("primary"))
+            if synthesized is None:
+                continue
+            for field in _INTERACTION_METADATA_FIELDS:
+                if field in synthesized:
+                    interactor[field] = synthesized[field]
+
+            # Metadata generator strips confidence fields at both levels
+            interactor.pop("confidence", None)
+            for func in interactor.get("functions", []):
+                if isinstance(func, dict):
+                    func.pop("confidence", None)
+
+    return pmid_payload
+
+
+def _write_files_atomic(files: Sequence[tuple[str, str]]) -> None:
+    """Write several text files so readers never observe a partial update.
+
+    Every file is written to a ``.tmp`` sibling first; only once all writes
+    succeed are they renamed into place with ``os.replace``.
+    """
+    tmp_paths = []
+    try:
+        for path, text in files:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            tmp_paths.append(tmp_path)
+    except Exception:
+        for tmp_path in tmp_paths:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        raise
+
+    for (path, _), tmp_path in zip(files, tmp_paths):
+        os.replace(tmp_path, path)
+
+
+def _do_db_sync(flask_app, user_query: str, merged_payload: Dict[str, Any]) -> bool:
+    """Sync merged re-query results to PostgreSQL, retrying with backoff.
+
+    Runs on the re-query job's thread before the job is marked complete:
+    the results and visualization endpoints build from the database, so the
+    job must not report 'complete' until the merged data is there. Failures
+    are reported to stderr and never affect the job status.
+
+    Returns:
+        True if the sync succeeded, False otherwise
+    """
+    from datetime import datetime
+
+    sync_start_time = datetime.now()
+    # Each banner is emitted as one multi-line record (one write) rather
+    # than one record per line.
+    log.info(
+        "\n%s\n"
+        "[RE-QUERY DB SYNC] Starting PostgreSQL sync for '%s' at %s\n"
+        "[RE-QUERY DB SYNC] Flask app provided: %s",
+        _BANNER, user_query, sync_start_time.strftime('%H:%M:%S'), flask_app is not None
+    )
+
+    if flask_app is None:
+        log.error(
+            "[ERROR][RE-QUERY DB SYNC] Flask app instance is None - CANNOT sync to PostgreSQL!\n"
+            "   Data preserved in file cache only\n"
+            "   Run 'python sync_cache_to_db.py %s' to sync manually\n"
+            "%s\n",
+            user_query, _BANNER
+        )
+        return False
+
+    max_retries = 3
+    retry_count = 0
+
+    while retry_count < max_retries:
+        try:
+            from utils.db_sync import DatabaseSyncLayer
+
+            if retry_count > 0:
+                wait_time = retry_count * 5
+                log.info("[RE-QUERY DB SYNC] Retry %d/%d in %ds...", retry_count, max_retries, wait_time)
+                time.sleep(wait_time)
+
+            # Test connection first
+            with flask_app.app_context():
+                from models import db
+                db.session.execute(db.text('SELECT 1'))
+                log.info("[RE-QUERY DB SYNC] [OK]Database connection verified")
+
+            # CRITICAL: Flask-SQLAlchemy requires app context in background threads
+            with flask_app.app_context():
+                sync_layer = DatabaseSyncLayer()
+
+                num_interactions = len(merged_payload.get("snapshot_json", {}).get("interactors", []))
+                log.info("[RE-QUERY DB SYNC] Syncing protein '%s' with %d interactions...", user_query, num_interactions)
+
+                db_stats = sync_layer.sync_query_results(
+                    protein_symbol=user_query,
+                    snapshot_json={"snapshot_json": merged_payload.get("snapshot_json", {})},
+                    ctx_json=merged_payload.get("ctx_json")
+                )
+
+                sync_duration = (datetime.now() - sync_start_time).total_seconds()
+                log.info(
+                    "[RE-QUERY DB SYNC] [OK]SUCCESS in %.1fs\n"
+                    "[RE-QUERY DB SYNC]   • Protein: %s\n"
+                    "[RE-QUERY DB SYNC]   • Interactions created: %s\n"
+                    "[RE-QUERY DB SYNC]   • Interactions updated: %s\n"
+                    "%s\n",
+                    sync_duration, user_query,
+                    db_stats['interactions_created'], db_stats['interactions_updated'],
+                    _BANNER
+                )
+                return True
+
+        except Exception as db_error:
+            retry_count += 1
+            if retry_count >= max_retries:
+                # Final failure - log details and continue with file cache
+                log.error(
+                    "\n[ERROR][RE-QUERY DB SYNC] FAILED after %d attempts\n"
+                    "   Error: %s\n"
+                    "   Data preserved in file cache at: cache/%s.json\n"
+                    "   Run 'python sync_cache_to_db.py %s' to sync manually\n"
+                    "%s\n",
+                    max_retries, db_error, user_query, user_query, _BANNER,
+                    exc_info=True
+                )
+            else:
+                log.warning("[WARN] [RE-QUERY DB SYNC] Attempt %d failed: %s", retry_count, db_error)
+
+    return False
 
 
 def run_requery_job(
@@ -2393,7 +2577,7 @@ def run_requery_job(
     total_steps = pipeline_step_count + post_steps
     current_step = 0
 
-    print(f"[RE-QUERY PROGRESS] Total steps calculated: {total_steps} (pipeline: {pipeline_step_count}, post: {post_steps})", file=sys.stderr)
+    log.info("[RE-QUERY PROGRESS] Total steps calculated: %d (pipeline: %d, post: %d)", total_steps, pipeline_step_count, post_steps)
 
     try:
         # --- STAGE 0: Load existing cache (with backward compatibility) ---
@@ -2408,7 +2592,7 @@ def run_requery_job(
         # Try to load from split files (new format) or single file (old format)
         if os.path.exists(metadata_path):
             # NEW FORMAT: Load from both files (snapshot + metadata)
-            print(f"Re-query: Loading from new split-file format", file=sys.stderr)
+            log.info("Re-query: Loading from new split-file format")
 
             with open(cache_path, 'r', encoding='utf-8') as f:
                 snapshot_data = json.load(f)
@@ -2423,7 +2607,7 @@ def run_requery_job(
             }
         else:
             # OLD FORMAT: Load from single file (backward compatibility)
-            print(f"Re-query: Loading from old single-file format", file=sys.stderr)
+            log.info("Re-query: Loading from old single-file format")
 
             with open(cache_path, 'r', encoding='utf-8') as f:
                 combined_data = json.load(f)
@@ -2436,7 +2620,7 @@ def run_requery_job(
 
             # If ctx_json is missing, try to extract it from the root level (very old format)
             if not existing_payload["ctx_json"] and "interactors" in combined_data:
-                print(f"Re-query: WARNING - Very old format detected, attempting migration", file=sys.stderr)
+                log.warning("Re-query: WARNING - Very old format detected, attempting migration")
                 existing_payload["ctx_json"] = {
                     "main": combined_data.get("main", user_query),
                     "interactors": combined_data.get("interactors", []),
@@ -2454,10 +2638,12 @@ def run_requery_job(
         existing_ctx = existing_payload.get("ctx_json", {})
         existing_interactors = existing_ctx.get("interactors", [])
         existing_symbols = [i.get("primary", "") for i in existing_interactors if i.get("primary")]
+        # Ordered list feeds the prompt; the set serves membership checks below
+        existing_symbol_set = frozenset(existing_symbols)
         existing_function_history = existing_ctx.get("function_history", {})
 
-        print(f"Re-query: Found {len(existing_symbols)} existing interactors", file=sys.stderr)
-        print(f"Re-query: Function history for {len(existing_function_history)} proteins", file=sys.stderr)
+        log.info("Re-query: Found %d existing interactors", len(existing_symbols))
+        log.info("Re-query: Function history for %d proteins", len(existing_function_history))
 
         # --- STAGE 1: Run FRESH pipeline with context ---
         # (validated_steps and total_steps already calculated above)
@@ -2524,7 +2710,7 @@ def run_requery_job(
         for step_idx, step in enumerate(validated_steps, start=1):
             # Check for cancellation before each step
             if cancel_event and cancel_event.is_set():
-                raise PipelineError("Job cancelled by user")
+                raise CancelledByUser("Job cancelled by user")
 
             # Report progress with user-friendly name
             friendly_name = _get_user_friendly_step_name(step.name)
@@ -2584,15 +2770,15 @@ def run_requery_job(
             if not primary:
                 continue
 
-            if primary in existing_symbols:
+            if primary in existing_symbol_set:
                 # This is an update to an existing interactor (likely new functions)
                 updated_existing_interactors.append(interactor)
             else:
                 # This is a completely new interactor
                 truly_new_interactors.append(interactor)
 
-        print(f"Re-query: Pipeline found {len(new_interactors)} interactors", file=sys.stderr)
-        print(f"Re-query: {len(truly_new_interactors)} are truly new, {len(updated_existing_interactors)} are updates to existing", file=sys.stderr)
+        log.info("Re-query: Pipeline found %d interactors", len(new_interactors))
+        log.info("Re-query: %d are truly new, %d are updates to existing", len(truly_new_interactors), len(updated_existing_interactors))
 
         # Combine for validation (both new and updates need validation)
         interactors_to_validate = truly_new_interactors + updated_existing_interactors
@@ -2627,8 +2813,35 @@ def run_requery_job(
                 verbose=False
             )
 
+        run_metadata = METADATA_GENERATOR_AVAILABLE and generate_interaction_metadata is not None
+        run_pmid_update = PMID_UPDATER_AVAILABLE and update_payload_pmids is not None
+
+        # --- STAGE 2.12 + 2.15: Metadata and PMID updates run concurrently ---
+        # Metadata synthesis is CPU-only while the PMID updater waits on PubMed,
+        # so overlapping them hides the shorter of the two. The PMID updater
+        # mutates its input in place, so it gets its own copy.
+        if run_metadata and run_pmid_update:
+            current_step += 2
+            update_status(
+                text="Analyzing interaction patterns and validating citations...",
+                current_step=current_step,
+                total_steps=total_steps
+            )
+            pmid_input = deepcopy(validated_new_payload)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                metadata_future = executor.submit(
+                    generate_interaction_metadata, validated_new_payload, verbose=False
+                )
+                pmid_future = executor.submit(
+                    update_payload_pmids, pmid_input, verbose=False
+                )
+                metadata_payload = metadata_future.result()
+                pmid_payload = pmid_future.result()
+
+            validated_new_payload = _overlay_interaction_metadata(pmid_payload, metadata_payload)
+
         # --- STAGE 2.12: Generate interaction metadata for new data ---
-        if METADATA_GENERATOR_AVAILABLE and generate_interaction_metadata is not None:
+        elif run_metadata:
             current_step += 1
             update_status(
                 text="Analyzing interaction patterns...",
@@ -2641,7 +2854,7 @@ def run_requery_job(
             )
 
         # --- STAGE 2.15: Update PMIDs for new data (before fact checker) ---
-        if PMID_UPDATER_AVAILABLE and update_payload_pmids is not None:
+        elif run_pmid_update:
             current_step += 1
             update_status(
                 text="Validating citations...",
@@ -2694,54 +2907,67 @@ def run_requery_job(
             total_steps=total_steps
         )
 
-        # Get validated new interactors
-        validated_new_interactors = validated_new_payload.get("ctx_json", {}).get("interactors", [])
+        # Bind the validated ctx once; every merge step below reads from it
+        validated_ctx = validated_new_payload.get("ctx_json") or {}
 
-        # Post-processing: Remove duplicate functions before merging
-        print(f"Re-query: Checking for duplicate functions before merge...", file=sys.stderr)
-        deduplicated_new_interactors = []
+        # Get validated new interactors
+        validated_new_interactors = validated_ctx.get("interactors", [])
 
-        for new_int in validated_new_interactors:
-            primary = new_int.get("primary")
-            new_functions = new_int.get("functions", [])
+        # Post-processing: Remove duplicate functions before merging.
+        # With no new interactors or no function history there is nothing
+        # a function could duplicate, so the scan is skipped entirely.
+        if not validated_new_interactors or not existing_function_history:
+            deduplicated_new_interactors = list(validated_new_interactors)
+        else:
+            log.info("Re-query: Checking for duplicate functions before merge...")
+            deduplicated_new_interactors = []
+            removed_duplicates: List[tuple[str, str]] = []
+
+            # Canonicalize existing function names once per protein instead
+            # of re-normalizing every existing name for every new function
+            existing_function_keys = {
+                protein: frozenset(
+                    name.strip().casefold() for name in funcs if isinstance(name, str)
+                )
+                for protein, funcs in existing_function_history.items()
+            }
 
-            if not primary or not new_functions:
-                deduplicated_new_interactors.append(new_int)
-                continue
+            for new_int in validated_new_interactors:
+                primary = new_int.get("primary")
+                new_functions = new_int.get("functions", [])
 
-            # Get existing functions for this protein
-            existing_funcs = existing_function_history.get(primary, [])
+                if not primary or not new_functions:
+                    deduplicated_new_interactors.append(new_int)
+                    continue
 
-            # Filter out duplicate functions
-            unique_functions = []
-            duplicates_found = 0
+                # Get existing functions for this protein
+                existing_keys = existing_function_keys.get(primary, frozenset())
 
-            for func in new_functions:
-                func_name = func.get("function", "").strip().lower()
+                # Filter out duplicate functions
+                unique_functions = []
 
-                # Check if this function name already exists (case-insensitive)
-                is_duplicate = any(
-                    func_name == existing_func.strip().lower()
-                    for existing_func in existing_funcs
-                )
+                for func in new_functions:
+                    func_name = (func.get("function") or "").strip().casefold()
 
-                if not is_duplicate:
-                    unique_functions.append(func)
-                else:
-                    duplicates_found += 1
-                    print(f"Re-query: Removed duplicate function '{func.get('function')}' for {primary}", file=sys.stderr)
+                    # Check if this function name already exists (case-insensitive)
+                    if func_name not in existing_keys:
+                        unique_functions.append(func)
+                    else:
+                        removed_duplicates.append((primary, func.get("function")))
 
-            # Update interactor with only unique functions
-            new_int_copy = deepcopy(new_int)
-            new_int_copy["functions"] = unique_functions
+                # Update interactor with only unique functions
+                new_int_copy = deepcopy(new_int)
+                new_int_copy["functions"] = unique_functions
 
-            if unique_functions or primary not in existing_symbols:
-                # Keep this interactor if it has unique functions OR is a new interactor
-                deduplicated_new_interactors.append(new_int_copy)
-            else:
-                print(f"Re-query: Skipping {primary} - all functions were duplicates", file=sys.stderr)
+                if unique_functions or primary not in existing_symbol_set:
+                    # Keep this interactor if it has unique functions OR is a new interactor
+                    deduplicated_new_interactors.append(new_int_copy)
+                else:
+                    log.info("Re-query: Skipping %s - all functions were duplicates", primary)
 
-        print(f"Re-query: Deduplication complete. Kept {len(deduplicated_new_interactors)} interactors", file=sys.stderr)
+            if removed_duplicates:
+                log.info("Re-query: Removed %d duplicate functions: %s", len(removed_duplicates), removed_duplicates)
+            log.info("Re-query: Deduplication complete. Kept %d interactors", len(deduplicated_new_interactors))
 
         # Merge with existing using deep merge
         merged_interactors = deep_merge_interactors(existing_interactors, deduplicated_new_interactors)
@@ -2751,30 +2977,29 @@ def run_requery_job(
 
         # Update tracking lists
         existing_interactor_history = existing_ctx.get("interactor_history", [])
-        new_interactor_history = validated_new_payload.get("ctx_json", {}).get("interactor_history", [])
+        new_interactor_history = validated_ctx.get("interactor_history", [])
         existing_ctx["interactor_history"] = existing_interactor_history + [
             x for x in new_interactor_history if x not in existing_interactor_history
         ]
 
         existing_function_batches = existing_ctx.get("function_batches", [])
-        new_function_batches = validated_new_payload.get("ctx_json", {}).get("function_batches", [])
+        new_function_batches = validated_ctx.get("function_batches", [])
         existing_ctx["function_batches"] = existing_function_batches + [
             x for x in new_function_batches if x not in existing_function_batches
         ]
 
-        # Merge function_history
+        # Merge function_history into a new dict (no in-place .extend on the
+        # loaded lists, so existing data is never aliased or mutated)
         existing_func_hist = existing_ctx.get("function_history", {})
-        new_func_hist = validated_new_payload.get("ctx_json", {}).get("function_history", {})
+        new_func_hist = validated_ctx.get("function_history", {})
+        merged_func_hist = dict(existing_func_hist)
         for protein, funcs in new_func_hist.items():
-            if protein in existing_func_hist:
-                existing_func_hist[protein].extend(funcs)
-            else:
-                existing_func_hist[protein] = funcs
-        existing_ctx["function_history"] = existing_func_hist
+            merged_func_hist[protein] = list(existing_func_hist.get(protein, [])) + list(funcs)
+        existing_ctx["function_history"] = merged_func_hist
 
-        # Rebuild snapshot with merged data
-        merged_payload = deepcopy(existing_payload)
-        merged_payload["ctx_json"] = existing_ctx
+        # Rebuild snapshot with merged data. Both keys of existing_payload are
+        # replaced below, so a deepcopy of it would be thrown away unread.
+        merged_payload = {"ctx_json": existing_ctx}
 
         # Regenerate snapshot_json from merged ctx_json
         merged_payload["snapshot_json"] = {
@@ -2803,89 +3028,29 @@ def run_requery_job(
             total_steps=total_steps
         )
         # File 1: PROTEIN.json - snapshot_json only (for visualization)
-        output_path = os.path.join(CACHE_DIR, f"{user_query}.json")
-        snapshot_only = {
-            "snapshot_json": merged_payload.get("snapshot_json", {})
-        }
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(snapshot_only, f, ensure_ascii=False, indent=2)
-
         # File 2: PROTEIN_metadata.json - ctx_json (full rich metadata)
-        metadata_path = os.path.join(CACHE_DIR, f"{user_query}_metadata.json")
-        metadata_only = {
-            "ctx_json": merged_payload.get("ctx_json", {})
-        }
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata_only, f, ensure_ascii=False, indent=2)
-
-        # --- STAGE 4.5: Sync to PostgreSQL database ---
-        from datetime import datetime
-        import time
-
-        sync_start_time = datetime.now()
-        print(f"\n{'='*60}", file=sys.stderr)
-        print(f"[RE-QUERY DB SYNC] Starting PostgreSQL sync for '{user_query}' at {sync_start_time.strftime('%H:%M:%S')}", file=sys.stderr)
-        print(f"[RE-QUERY DB SYNC] Flask app provided: {flask_app is not None}", file=sys.stderr)
-
-        if flask_app is None:
-            print(f"[ERROR][RE-QUERY DB SYNC] Flask app instance is None - CANNOT sync to PostgreSQL!", file=sys.stderr)
-            print(f"   Data preserved in file cache only", file=sys.stderr)
-            print(f"   Run 'python sync_cache_to_db.py {user_query}' to sync manually", file=sys.stderr)
-            print(f"{'='*60}\n", file=sys.stderr)
-        else:
-            max_retries = 3
-            retry_count = 0
-            sync_success = False
-
-            while retry_count < max_retries and not sync_success:
-                try:
-                    from utils.db_sync import DatabaseSyncLayer
-
-                    if retry_count > 0:
-                        wait_time = retry_count * 5
-                        print(f"[RE-QUERY DB SYNC] Retry {retry_count}/{max_retries} in {wait_time}s...", file=sys.stderr)
-                        time.sleep(wait_time)
-
-                    # Test connection first
-                    with flask_app.app_context():
-                        from models import db
-                        db.session.execute(db.text('SELECT 1'))
-                        print(f"[RE-QUERY DB SYNC] [OK]Database connection verified", file=sys.stderr)
-
-                    # CRITICAL: Flask-SQLAlchemy requires app context in background threads
-                    with flask_app.app_context():
-                        sync_layer = DatabaseSyncLayer()
-
-                        num_interactions = len(merged_payload.get("snapshot_json", {}).get("interactors", []))
-                        print(f"[RE-QUERY DB SYNC] Syncing protein '{user_query}' with {num_interactions} interactions...", file=sys.stderr)
-
-                        db_stats = sync_layer.sync_query_results(
-                            protein_symbol=user_query,
-                            snapshot_json={"snapshot_json": merged_payload.get("snapshot_json", {})},
-                            ctx_json=merged_payload.get("ctx_json")
-                        )
+        # Paths were resolved at STAGE 0; both files are swapped in together.
+        output_path = cache_path
+        snapshot_text = json.dumps(
+            {"snapshot_json": merged_payload.get("snapshot_json", {})},
+            ensure_ascii=False,
+            indent=2
+        )
+        metadata_text = json.dumps(
+            {"ctx_json": merged_payload.get("ctx_json", {})},
+            ensure_ascii=False,
+            indent=2
+        )
 
-                        sync_duration = (datetime.now() - sync_start_time).total_seconds()
-                        print(f"[RE-QUERY DB SYNC] [OK]SUCCESS in {sync_duration:.1f}s", file=sys.stderr)
-                        print(f"[RE-QUERY DB SYNC]   • Protein: {user_query}", file=sys.stderr)
-                        print(f"[RE-QUERY DB SYNC]   • Interactions created: {db_stats['interactions_created']}", file=sys.stderr)
-                        print(f"[RE-QUERY DB SYNC]   • Interactions updated: {db_stats['interactions_updated']}", file=sys.stderr)
-                        print(f"{'='*60}\n", file=sys.stderr)
-                        sync_success = True
+        _write_files_atomic([(output_path, snapshot_text), (metadata_path, metadata_text)])
 
-                except Exception as db_error:
-                    retry_count += 1
-                    if retry_count >= max_retries:
-                        # Final failure - log details and continue with file cache
-                        print(f"\n[ERROR][RE-QUERY DB SYNC] FAILED after {max_retries} attempts", file=sys.stderr)
-                        print(f"   Error: {db_error}", file=sys.stderr)
-                        print(f"   Data preserved in file cache at: cache/{user_query}.json", file=sys.stderr)
-                        print(f"   Run 'python sync_cache_to_db.py {user_query}' to sync manually", file=sys.stderr)
-                        print(f"{'='*60}\n", file=sys.stderr)
-                        import traceback
-                        traceback.print_exc(file=sys.stderr)
-                    else:
-                        print(f"[WARN] [RE-QUERY DB SYNC] Attempt {retry_count} failed: {db_error}", file=sys.stderr)
+        # --- STAGE 4.5: Sync to PostgreSQL database ---
+        # Runs only after serialization (the sync layer fixes chain fields in
+        # place) and after the cache files are in place, so a failed write
+        # never leaves the database ahead of the files. /api/results and
+        # /api/visualize build from the database, so the job stays 'running'
+        # until the sync has finished.
+        _do_db_sync(flask_app, user_query, merged_payload)
 
         # Build detailed completion message with list of new items
         result_parts = []
@@ -2912,48 +3077,46 @@ def run_requery_job(
         if detailed_new_items:
             result_message += " || " + " | ".join(detailed_new_items)
 
-        print(f"Re-query: {result_message}", file=sys.stderr)
-        print(f"Re-query: Saved to {output_path}", file=sys.stderr)
+        log.info("Re-query: %s", result_message)
+        log.info("Re-query: Saved to %s", output_path)
 
         # --- STAGE 5: Mark job as complete ---
-        print(f"Re-query: Marking job as complete for {user_query}", file=sys.stderr)
+        log.info("Re-query: Marking job as complete for %s", user_query)
         with lock:
             if user_query in jobs:
                 if jobs[user_query].get('cancel_event') is cancel_event:
                     jobs[user_query]['status'] = 'complete'
                     jobs[user_query]['progress'] = result_message
-                    print(f"Re-query: Successfully set status to 'complete'", file=sys.stderr)
+                    log.info("Re-query: Successfully set status to 'complete'")
                 else:
-                    print(f"Re-query: Cancel event mismatch, not updating status", file=sys.stderr)
+                    log.warning("Re-query: Cancel event mismatch, not updating status")
             else:
-                print(f"Re-query: Job {user_query} not found in jobs dict", file=sys.stderr)
+                log.warning("Re-query: Job %s not found in jobs dict", user_query)
+
+    except CancelledByUser:
+        log.info("RE-QUERY CANCELLED for '%s'", user_query)
+        with lock:
+            if user_query in jobs and jobs[user_query].get('cancel_event') is cancel_event:
+                jobs[user_query]['status'] = 'cancelled'
+                jobs[user_query]['progress'] = {"text": "Cancelled by user"}
 
     except Exception as e:
         error_message = f"Error: {str(e)}"
-        is_cancelled = "cancelled by user" in error_message.lower()
+        log.error("RE-QUERY ERROR for '%s': %s", user_query, error_message, exc_info=True)
 
-        if is_cancelled:
-            print(f"RE-QUERY CANCELLED for '{user_query}'", file=sys.stderr)
-            with lock:
-                if user_query in jobs and jobs[user_query].get('cancel_event') is cancel_event:
-                    jobs[user_query]['status'] = 'cancelled'
-                    jobs[user_query]['progress'] = {"text": "Cancelled by user"}
-        else:
-            print(f"RE-QUERY ERROR for '{user_query}': {error_message}", file=sys.stderr)
-            import traceback
-            traceback.print_exc(file=sys.stderr)
-
-            with lock:
-                if user_query in jobs and jobs[user_query].get('cancel_event') is cancel_event:
-                    jobs[user_query]['status'] = 'error'
-                    jobs[user_query]['progress'] = {"text": error_message}
+        with lock:
+            if user_query in jobs and jobs[user_query].get('cancel_event') is cancel_event:
+                jobs[user_query]['status'] = 'error'
+                jobs[user_query]['progress'] = {"text": error_message}
 
 
 # ============================================================================
 # CLI INTERFACE (ORIGINAL FUNCTIONALITY PRESERVED)
 # ============================================================================
 
-def main() -> None:
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; repeated in-process main() calls reuse it."""
     parser = argparse.ArgumentParser(
         description="Enhanced pipeline runner with evidence validation"
     )
@@ -3013,7 +3176,12 @@ def main() -> None:
         action="store_true",
         help="Prompt for number of discovery rounds interactively"
     )
+    return parser
 
+
+def main() -> None:
+    configure_logging()
+    parser = _build_parser()
     args = parser.parse_args()
 
     # Viz-only mode
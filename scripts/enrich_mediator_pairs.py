@@ -21,18 +21,27 @@ Uses Gemini 2.5 Pro with extended thinking + Google Search grounding.
 """
 
 import os
+import re
 import sys
 import json
+import asyncio
+import hashlib
 import argparse
-from datetime import datetime
+import functools
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Literal, Optional, Sequence, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
+from sqlalchemy import cast, func, select, tuple_
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import flag_modified
 from models import db, Protein, Interaction
 from app import app
 
@@ -40,6 +49,7 @@ from app import app
 try:
     from google import genai as google_genai
     from google.genai import types
+    from pydantic import BaseModel, ConfigDict, Field  # installed with google-genai
     GEMINI_AVAILABLE = True
 except ImportError:
     GEMINI_AVAILABLE = False
@@ -52,18 +62,171 @@ MAX_THINKING_TOKENS = 32768  # Extended thinking budget
 MAX_OUTPUT_TOKENS = 65536    # Match runner.py
 TEMPERATURE = 0.3            # Match runner.py
 TOP_P = 0.90                 # Match runner.py
-MAX_WORKERS = 3              # Conservative for complex queries
+MAX_WORKERS = 3              # Max concurrent Gemini requests (conservative for complex queries)
+
+GEMINI_MODEL = "gemini-2.5-pro"  # Match runner.py
 
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
+# Enriched pair results, keyed by sha256 of (mediator, target, function_name)
+PAIR_CACHE_DIR = Path("cache") / "gemini_pairs"
+PAIR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+# Generation config is identical for every request, so it is built once at
+# import instead of re-validating ~6 pydantic models per call.
+_GENERATE_CONFIG = types.GenerateContentConfig(
+    temperature=TEMPERATURE,
+    top_p=TOP_P,
+    max_output_tokens=MAX_OUTPUT_TOKENS,
+    thinking_config=types.ThinkingConfig(
+        thinking_budget=MAX_THINKING_TOKENS,
+        include_thoughts=True
+    ),
+    response_modalities=["TEXT"],
+    safety_settings=[
+        types.SafetySetting(category="HARM_CATEGORY_HATE_SPEECH", threshold="OFF"),
+        types.SafetySetting(category="HARM_CATEGORY_DANGEROUS_CONTENT", threshold="OFF"),
+        types.SafetySetting(category="HARM_CATEGORY_HARASSMENT", threshold="OFF"),
+        types.SafetySetting(category="HARM_CATEGORY_SEXUALLY_EXPLICIT", threshold="OFF"),
+    ],
+    tools=[types.Tool(google_search=types.GoogleSearch())]  # Enable Google Search
+    # NOTE: Cannot use response_mime_type with tools - parse JSON manually from text response
+)
+
+
+class Evidence(BaseModel):
+    """One supporting paper in an enriched function's evidence list."""
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+    pmid: Optional[str] = None
+    doi: Optional[str] = None
+    paper_title: Optional[str] = None
+
+
+class EnrichedFunction(BaseModel):
+    """Shape of the function JSON Gemini returns for a mediator-target pair."""
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+    function: str = Field(min_length=1)
+    arrow: Literal["activates", "inhibits", "binds", "regulates"]
+    cellular_process: str = Field(min_length=1)
+    biological_consequence: List[str] = Field(min_length=1)
+    specific_effects: List[str] = Field(min_length=1)
+    evidence: List[Evidence] = []
+    pmids: List[str] = []
+    confidence: float = 0.75
+
+
+# Prompt templates are built once; only the pair-specific fields are
+# substituted per request via str.format
+_SYSTEM_TEMPLATE = """You are an expert molecular biologist specializing in protein-protein interactions.
+
+Your task: Research and describe the DIRECT interaction between {mediator} and {target} proteins.
+
+CRITICAL REQUIREMENTS:
+1. Describe the NORMAL interaction between {mediator} and {target} (independent of any upstream regulators)
+2. Focus on how {mediator} affects {target} in the context of: {function_name}
+3. Use Google Search to find primary research papers
+4. Provide COMPLETE data with all fields filled out
+5. Include biological cascade, cellular process, evidence, PMIDs
+6. Be comprehensive - this is for a scientific database
+
+Context: This pair is part of a larger signaling chain, but you should describe their DIRECT relationship,
+not the net effect through the chain.
+"""
+
+_PROMPT_TEMPLATE = """Research the direct protein-protein interaction between {mediator} and {target}.
+
+**Target Function Context**: {function_name}
+**Background**: {function_context}
+
+Your task is to describe how {mediator} NORMALLY interacts with {target} (independent of upstream regulators).
+
+Use Google Search to find primary research papers about {mediator}-{target} interaction.
+
+Return a JSON object with this EXACT structure:
+
+{{
+  "function": "{function_name}",
+  "arrow": "activates|inhibits|binds|regulates",
+  "direction": "main_to_primary",
+  "cellular_process": "Detailed description of the molecular mechanism...",
+  "effect_description": "Description of the biological effect...",
+  "biological_consequence": [
+    "Step 1 of cascade",
+    "Step 2 of cascade",
+    "..."
+  ],
+  "specific_effects": [
+    "Specific effect 1",
+    "Specific effect 2",
+    "..."
+  ],
+  "evidence": [
+    {{
+      "pmid": "12345678",
+      "doi": "10.1234/...",
+      "paper_title": "...",
+      "authors": "...",
+      "journal": "...",
+      "year": 2020,
+      "species": "human",
+      "assay": "Co-IP, Western blot, ...",
+      "relevant_quote": "..."
+    }}
+  ],
+  "pmids": ["12345678", "87654321"],
+  "confidence": 0.85
+}}
+
+CRITICAL:
+- "arrow" must reflect {mediator}'s NORMAL effect on {target} (NOT net effect through chain)
+- "cellular_process" should be detailed (100-200 words)
+- "biological_consequence" should be a step-by-step cascade (5-10 steps)
+- "specific_effects" should list specific molecular events (5-10 items)
+- "evidence" must include at least 2-3 primary research papers with PMIDs
+- "relevant_quote" should be actual quotes from papers
+
+Focus on {function_name} but describe the normal {mediator}→{target} relationship.
+"""
+
+# Leading ```/```json and trailing ``` fences around a JSON response
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def utc_now() -> datetime:
+    """Naive UTC timestamp, matching the DateTime columns in models.py."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
-def call_gemini_with_thinking(
+
+def _pair_cache_path(mediator: str, target: str, function_name: str) -> Path:
+    """Return the on-disk cache file for one enriched mediator-target pair."""
+    key = hashlib.sha256(f"{mediator}|{target}|{function_name}".encode("utf-8")).hexdigest()
+    return PAIR_CACHE_DIR / f"{key}.json"
+
+
+# Small thread pool for JSON parsing/validation of Gemini responses; parses
+# take milliseconds, so a process pool's pickling overhead would dominate
+_PARSE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gemini-parse")
+
+
+def _parse_json_response(text: str, schema: Optional[type] = None) -> Dict[str, Any]:
+    """Strip markdown code fences and parse (and optionally validate) a JSON response."""
+    text = _FENCE.sub("", text.strip())
+    if schema is not None:
+        return schema.model_validate_json(text).model_dump(exclude_unset=True)
+    return json.loads(text)
+
+
+async def call_gemini_with_thinking(
     prompt: str,
     api_key: str,
     system_instruction: str = "",
     response_format: str = "json",
-    max_retries: int = 3
+    max_retries: int = 3,
+    schema: Optional[type] = None,
+    client: Optional["google_genai.Client"] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Call Gemini 2.5 Pro with thinking budget and Google Search (matches runner.py config).
@@ -74,104 +237,82 @@ def call_gemini_with_thinking(
         system_instruction: System instruction
         response_format: "json" or "text"
         max_retries: Number of retries on failure
+        schema: Optional pydantic model the JSON response is validated against
+            (a validation failure is retried like any other error)
+        client: Gemini client created on the running event loop (a one-off
+            client for this call if None)
 
     Returns:
         Parsed JSON response or None on failure
     """
-    client = google_genai.Client(api_key=api_key)
-
-    # Configure thinking mode - Match runner.py pattern
-    thinking_config = types.ThinkingConfig(
-        thinking_budget=MAX_THINKING_TOKENS,
-        include_thoughts=True
-    )
-
-    # Configure generation - Match runner.py configuration
-    config_args = {
-        "temperature": TEMPERATURE,
-        "top_p": TOP_P,
-        "max_output_tokens": MAX_OUTPUT_TOKENS,
-        "thinking_config": thinking_config,
-        "response_modalities": ["TEXT"],
-        "safety_settings": [
-            types.SafetySetting(
-                category="HARM_CATEGORY_HATE_SPEECH",
-                threshold="OFF"
-            ),
-            types.SafetySetting(
-                category="HARM_CATEGORY_DANGEROUS_CONTENT",
-                threshold="OFF"
-            ),
-            types.SafetySetting(
-                category="HARM_CATEGORY_HARASSMENT",
-                threshold="OFF"
-            ),
-            types.SafetySetting(
-                category="HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                threshold="OFF"
+    if client is None:
+        # The async transport is bound to this event loop, so never cache it
+        # across asyncio.run calls; a one-off client is closed when done
+        client = google_genai.Client(api_key=api_key)
+        try:
+            return await call_gemini_with_thinking(
+                prompt, api_key, system_instruction, response_format, max_retries, schema,
+                client=client
             )
-        ],
-        "tools": [types.Tool(google_search=types.GoogleSearch())]  # Enable Google Search
-        # NOTE: Cannot use response_mime_type with tools - parse JSON manually from text response
-    }
-
-    config = types.GenerateContentConfig(**config_args)
+        finally:
+            await client.aio.aclose()
 
-    # Use gemini-2.5-pro like runner.py
-    model_name = "gemini-2.5-pro"
+    # Shallow copy: the shared config's nested models are reused, not re-validated
+    config = (
+        _GENERATE_CONFIG.model_copy(update={"system_instruction": system_instruction})
+        if system_instruction else _GENERATE_CONFIG
+    )
 
     for attempt in range(max_retries):
         try:
-            response = client.models.generate_content(
-                model=model_name,
+            # Stream the response so chunks are consumed as they arrive
+            stream = await client.aio.models.generate_content_stream(
+                model=GEMINI_MODEL,
                 contents=prompt,
                 config=config
             )
+            chunks = [chunk.text async for chunk in stream if chunk.text]
+            text = "".join(chunks)
 
             if response_format == "json":
-                # Parse JSON response
-                text = response.text.strip()
-                # Remove markdown code blocks if present
-                if text.startswith("```json"):
-                    text = text[7:]
-                if text.startswith("```"):
-                    text = text[3:]
-                if text.endswith("```"):
-                    text = text[:-3]
-                text = text.strip()
-
-                return json.loads(text)
+                # Parse off the event loop so it overlaps other in-flight requests
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(_PARSE_POOL, _parse_json_response, text, schema)
             else:
-                return {"text": response.text}
+                return {"text": text}
 
         except Exception as e:
             print(f"[ERROR] Gemini call failed (attempt {attempt+1}/{max_retries}): {e}")
             if attempt < max_retries - 1:
-                import time
-                time.sleep(2 ** attempt)  # Exponential backoff
+                await asyncio.sleep(2 ** attempt)  # Exponential backoff
             else:
                 return None
 
     return None
 
 
-def extract_function_context(indirect_interaction: Dict[str, Any]) -> Tuple[str, str]:
+def extract_function_context(functions: Sequence[Dict[str, Any]]) -> Tuple[str, str]:
     """
     Extract the function name and context from an indirect interaction.
 
     Args:
-        indirect_interaction: Indirect interaction data
+        functions: The indirect interaction's functions list
 
     Returns:
         (function_name, function_context) tuple
     """
-    functions = indirect_interaction.get("data", {}).get("functions", [])
-
     if not functions:
         return ("Unknown Function", "general cellular processes")
 
-    # Get primary function (first one, or one with most detail)
-    primary_func = max(functions, key=lambda f: len(f.get("cellular_process", "")))
+    # Get primary function (first one with the most detailed cellular_process)
+    primary_func = functions[0]
+    if len(functions) > 1:
+        best_len = len(primary_func.get("cellular_process") or "")
+        for func in functions[1:]:
+            func_len = len(func.get("cellular_process") or "")
+            if func_len > best_len:
+                primary_func = func
+                best_len = func_len
 
     function_name = primary_func.get("function", "Unknown Function")
 
@@ -189,13 +330,16 @@ def extract_function_context(indirect_interaction: Dict[str, Any]) -> Tuple[str,
     return (function_name, function_context)
 
 
-def enrich_mediator_target_pair(
+async def enrich_mediator_target_pair(
     mediator: str,
     target: str,
     function_name: str,
     function_context: str,
     api_key: str,
-    verbose: bool = False
+    verbose: bool = False,
+    run_started: Optional[datetime] = None,
+    use_cache: bool = True,
+    client: Optional["google_genai.Client"] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Use Gemini to research and create complete function data for mediator→target pair.
@@ -210,110 +354,68 @@ def enrich_mediator_target_pair(
         function_context: Context from chain (e.g., "RHEB activates mTOR kinase...")
         api_key: Google AI API key
         verbose: Enable detailed logging
+        run_started: Shared run timestamp for _enriched_at (now if None)
+        use_cache: Reuse/store results in PAIR_CACHE_DIR
+        client: Gemini client shared by the run (a one-off client per call if None)
 
     Returns:
         Complete function dict with all fields filled out
     """
+    cache_path = _pair_cache_path(mediator, target, function_name)
+    if use_cache and cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if verbose:
+                print(f"    [ENRICH] Cache hit for {mediator} → {target} ({function_name})")
+            return cached
+        except (OSError, ValueError) as e:
+            print(f"    [WARN] Ignoring unreadable cache file {cache_path.name}: {e}")
+
     if verbose:
         print(f"    [ENRICH] Researching {mediator} → {target} interaction")
         print(f"             Function context: {function_name}")
 
-    system_instruction = f"""You are an expert molecular biologist specializing in protein-protein interactions.
-
-Your task: Research and describe the DIRECT interaction between {mediator} and {target} proteins.
-
-CRITICAL REQUIREMENTS:
-1. Describe the NORMAL interaction between {mediator} and {target} (independent of any upstream regulators)
-2. Focus on how {mediator} affects {target} in the context of: {function_name}
-3. Use Google Search to find primary research papers
-4. Provide COMPLETE data with all fields filled out
-5. Include biological cascade, cellular process, evidence, PMIDs
-6. Be comprehensive - this is for a scientific database
-
-Context: This pair is part of a larger signaling chain, but you should describe their DIRECT relationship,
-not the net effect through the chain.
-"""
-
-    prompt = f"""Research the direct protein-protein interaction between {mediator} and {target}.
-
-**Target Function Context**: {function_name}
-**Background**: {function_context}
-
-Your task is to describe how {mediator} NORMALLY interacts with {target} (independent of upstream regulators).
-
-Use Google Search to find primary research papers about {mediator}-{target} interaction.
-
-Return a JSON object with this EXACT structure:
-
-{{
-  "function": "{function_name}",
-  "arrow": "activates|inhibits|binds|regulates",
-  "direction": "main_to_primary",
-  "cellular_process": "Detailed description of the molecular mechanism...",
-  "effect_description": "Description of the biological effect...",
-  "biological_consequence": [
-    "Step 1 of cascade",
-    "Step 2 of cascade",
-    "..."
-  ],
-  "specific_effects": [
-    "Specific effect 1",
-    "Specific effect 2",
-    "..."
-  ],
-  "evidence": [
-    {{
-      "pmid": "12345678",
-      "doi": "10.1234/...",
-      "paper_title": "...",
-      "authors": "...",
-      "journal": "...",
-      "year": 2020,
-      "species": "human",
-      "assay": "Co-IP, Western blot, ...",
-      "relevant_quote": "..."
-    }}
-  ],
-  "pmids": ["12345678", "87654321"],
-  "confidence": 0.85
-}}
-
-CRITICAL:
-- "arrow" must reflect {mediator}'s NORMAL effect on {target} (NOT net effect through chain)
-- "cellular_process" should be detailed (100-200 words)
-- "biological_consequence" should be a step-by-step cascade (5-10 steps)
-- "specific_effects" should list specific molecular events (5-10 items)
-- "evidence" must include at least 2-3 primary research papers with PMIDs
-- "relevant_quote" should be actual quotes from papers
+    system_instruction = _SYSTEM_TEMPLATE.format(
+        mediator=mediator,
+        target=target,
+        function_name=function_name
+    )
 
-Focus on {function_name} but describe the normal {mediator}→{target} relationship.
-"""
+    prompt = _PROMPT_TEMPLATE.format(
+        mediator=mediator,
+        target=target,
+        function_name=function_name,
+        function_context=function_context
+    )
 
-    result = call_gemini_with_thinking(
+    result = await call_gemini_with_thinking(
         prompt=prompt,
         api_key=api_key,
         system_instruction=system_instruction,
-        response_format="json"
+        response_format="json",
+        schema=EnrichedFunction,
+        client=client
     )
 
     if not result:
         if verbose:
-            print(f"    [ENRICH] Failed to get response from Gemini")
+            print(f"    [ENRICH] Failed to get a valid response from Gemini")
         return None
 
-    # Validate required fields
-    required_fields = ["function", "arrow", "cellular_process", "biological_consequence", "specific_effects"]
-    for field in required_fields:
-        if field not in result or not result[field]:
-            if verbose:
-                print(f"    [ENRICH] Missing required field: {field}")
-            return None
-
     # Add metadata
     result["_enriched_by_script"] = True
-    result["_enriched_at"] = datetime.utcnow().isoformat()
+    result["_enriched_at"] = (run_started or utc_now()).isoformat()
     result["function_context"] = "direct"  # Mark as direct (not net effect)
 
+    if use_cache:
+        # Atomic write so an interrupted run never leaves a truncated entry
+        tmp_path = cache_path.with_suffix(".json.tmp")
+        try:
+            tmp_path.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"    [WARN] Could not write pair cache: {e}")
+
     if verbose:
         print(f"    [ENRICH] ✓ Successfully enriched with {len(result.get('evidence', []))} papers")
         print(f"             Arrow: {result.get('arrow', 'unknown')}")
@@ -322,32 +424,37 @@ Focus on {function_name} but describe the normal {mediator}→{target} relations
     return result
 
 
-def process_indirect_interaction(
-    interaction_data: Dict[str, Any],
+async def process_indirect_interaction(
+    ixn: "IxnView",
     api_key: str,
     verbose: bool = False,
-    dry_run: bool = True
+    dry_run: bool = True,
+    protein_ids: Optional[Dict[str, int]] = None,
+    run_started: Optional[datetime] = None,
+    use_cache: bool = True,
+    client: Optional["google_genai.Client"] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Process one indirect interaction to enrich its mediator-target pair.
 
     Args:
-        interaction_data: Indirect interaction data
+        ixn: Indirect interaction view
         api_key: Google AI API key
         verbose: Enable detailed logging
-        dry_run: If True, don't write to database
+        dry_run: Kept for compatibility; this function never writes (see apply_enrichment_ops)
+        protein_ids: Preloaded symbol -> protein ID map (memoized lookups if None)
+        run_started: Shared run timestamp for enrichment/created/updated times (now if None)
+        use_cache: Reuse/store Gemini results in PAIR_CACHE_DIR
+        client: Gemini client shared by the run (a one-off client per call if None)
 
     Returns:
-        Enrichment result or None
+        ("upsert", function_name, interaction_row) op for apply_enrichment_ops, or None
     """
     # Extract chain information
-    main_protein = interaction_data["main_protein"]
-    target_protein = interaction_data["partner_protein"]
-    upstream_interactor = interaction_data.get("upstream_interactor")
-    mediator_chain = interaction_data.get("mediator_chain", [])
-
-    # Determine mediator
-    mediator = upstream_interactor or (mediator_chain[-1] if mediator_chain else None)
+    main_protein = ixn.main
+    target_protein = ixn.partner
+    mediator = ixn.mediator
+    run_started = run_started or utc_now()
 
     if not mediator:
         if verbose:
@@ -357,140 +464,304 @@ def process_indirect_interaction(
     print(f"\n  Processing: {main_protein} → {mediator} → {target_protein}")
 
     # Extract function context from the indirect interaction
-    function_name, function_context = extract_function_context(interaction_data)
+    function_name, function_context = extract_function_context(ixn.functions)
 
     print(f"    Function: {function_name}")
     print(f"    Researching direct pair: {mediator} → {target_protein}")
 
     # Enrich the mediator-target pair
-    enriched_function = enrich_mediator_target_pair(
+    enriched_function = await enrich_mediator_target_pair(
         mediator=mediator,
         target=target_protein,
         function_name=function_name,
         function_context=function_context,
         api_key=api_key,
-        verbose=verbose
+        verbose=verbose,
+        run_started=run_started,
+        use_cache=use_cache,
+        client=client
     )
 
     if not enriched_function:
         return None
 
-    # Check if mediator-target interaction exists in database
-    with app.app_context():
-        mediator_protein = Protein.query.filter_by(symbol=mediator).first()
-        target_protein_obj = Protein.query.filter_by(symbol=target_protein).first()
-
-        if not mediator_protein or not target_protein_obj:
-            print(f"    [ERROR] Protein not found in database: {mediator} or {target_protein}")
-            return None
-
-        # Query for existing interaction
-        if mediator_protein.id < target_protein_obj.id:
-            existing = db.session.query(Interaction).filter(
-                Interaction.protein_a_id == mediator_protein.id,
-                Interaction.protein_b_id == target_protein_obj.id
-            ).first()
-        else:
-            existing = db.session.query(Interaction).filter(
-                Interaction.protein_a_id == target_protein_obj.id,
-                Interaction.protein_b_id == mediator_protein.id
-            ).first()
-
-        if existing:
-            print(f"    [UPDATE] Interaction exists (ID: {existing.id}), adding enriched function")
-
-            # Add enriched function to existing interaction
-            data = existing.data.copy()
-            if "functions" not in data:
-                data["functions"] = []
-
-            # Check if function already exists (avoid duplicates)
-            existing_funcs = [f.get("function") for f in data["functions"]]
-            if function_name in existing_funcs:
-                # Update existing function
-                for i, func in enumerate(data["functions"]):
-                    if func.get("function") == function_name and func.get("function_context") == "direct":
-                        data["functions"][i] = enriched_function
-                        break
-                else:
-                    # No direct version exists, add it
-                    data["functions"].append(enriched_function)
-            else:
-                # Add new function
-                data["functions"].append(enriched_function)
-
-            # Ensure interaction properties are correct
-            data["interaction_type"] = "direct"
-            data["function_context"] = "direct"
-
-            if not dry_run:
-                existing.data = data
-                existing.interaction_type = "direct"
-                existing.function_context = "direct"
-                existing.updated_at = datetime.utcnow()
-                db.session.commit()
-                print(f"    [UPDATE] ✓ Updated database")
-            else:
-                print(f"    [DRY-RUN] Would update database")
+    # Resolve protein IDs (existing rows are matched at apply time)
+    if protein_ids is None:
+        with app.app_context():
+            mediator_id = _protein_by_symbol(mediator)
+            target_id = _protein_by_symbol(target_protein)
+    else:
+        mediator_id = protein_ids.get(mediator)
+        target_id = protein_ids.get(target_protein)
+
+    if mediator_id is None or target_id is None:
+        print(f"    [ERROR] Protein not found in database: {mediator} or {target_protein}")
+        return None
+
+    print(f"    [QUEUE] Queued enriched function for {mediator} → {target_protein}")
+
+    # Direct interaction row to insert if the pair does not exist yet
+    protein_a_id, protein_b_id, direction = canonical_pair(mediator_id, target_id)
+
+    # Build interaction data
+    interaction_data_new = {
+        "primary": target_protein,
+        "direction": "main_to_primary",  # From mediator's perspective
+        "arrow": enriched_function.get("arrow", "activates"),
+        "interaction_type": "direct",
+        "function_context": "direct",
+        "functions": [enriched_function],
+        "evidence": enriched_function.get("evidence", []),
+        "pmids": enriched_function.get("pmids", []),
+        "confidence": enriched_function.get("confidence", 0.75),
+        "_inferred_from_chain": True,
+        "_enriched_by_script": True,
+        "_original_chain": f"{main_protein}→{mediator}→{target_protein}"
+    }
+
+    return ("upsert", function_name, dict(
+        protein_a_id=protein_a_id,
+        protein_b_id=protein_b_id,
+        confidence=interaction_data_new.get("confidence", 0.75),
+        direction=direction,
+        arrow=enriched_function.get("arrow", "activates"),
+        data=interaction_data_new,
+        discovered_in_query=main_protein,
+        discovery_method="mediator_pair_enrichment",
+        interaction_type="direct",
+        function_context="direct",
+        upstream_interactor=None,
+        mediator_chain=None,
+        depth=1,
+        created_at=run_started,
+        updated_at=run_started
+    ))
+
+
+def canonical_pair(mediator_id: int, target_id: int) -> Tuple[int, int, str]:
+    """
+    Order a mediator → target pair as (protein_a_id, protein_b_id, direction).
+
+    The lower ID is always protein_a; direction records which way mediator → target runs.
+    """
+    if mediator_id < target_id:
+        return (mediator_id, target_id, "a_to_b")
+    return (target_id, mediator_id, "b_to_a")
+
+
+def merge_enriched_function(data: Dict[str, Any], function_name: str, enriched_function: Dict[str, Any]) -> None:
+    """
+    Merge an enriched function into an interaction's data dict in place.
+
+    Replaces an existing direct-context function of the same name, otherwise appends.
+    Callers holding an ORM row must flag_modified(row, "data") afterwards.
+    """
+    functions = data.setdefault("functions", [])
+
+    # Index direct-context functions by name (first occurrence wins)
+    direct_index: Dict[str, int] = {}
+    for i, func in enumerate(functions):
+        if func.get("function_context") == "direct":
+            direct_index.setdefault(func.get("function"), i)
+
+    idx = direct_index.get(function_name)
+    if idx is not None:
+        # Update existing direct version
+        functions[idx] = enriched_function
+    else:
+        # Add new function (or direct version alongside a non-direct one)
+        functions.append(enriched_function)
+
+    # Ensure interaction properties are correct
+    data["interaction_type"] = "direct"
+    data["function_context"] = "direct"
+
+
+def apply_enrichment_ops(ops: List[Tuple], run_started: Optional[datetime] = None) -> Tuple[int, int]:
+    """
+    Apply queued upsert ops from process_indirect_interaction in one transaction.
+
+    Ops for the same mediator-target pair are folded together first. Pairs that
+    already exist are found with one query and have their functions merged in
+    Python; the rest are written with a single INSERT ... ON CONFLICT on the
+    interaction_unique constraint, which appends the functions if another
+    writer created the pair in the meantime. Must be called inside an app context.
+
+    Returns:
+        (updated_count, created_count) tuple
+    """
+    pending: Dict[Tuple[int, int], Tuple[Dict[str, Any], List[Tuple[str, Dict[str, Any]]]]] = {}
+    for _, function_name, row in ops:
+        key = (row["protein_a_id"], row["protein_b_id"])
+        enriched_function = row["data"]["functions"][0]
+        if key in pending:
+            pending[key][1].append((function_name, enriched_function))
         else:
-            print(f"    [CREATE] Interaction does not exist, creating new entry")
-
-            # CREATE new direct interaction
-            # Determine canonical ordering
-            if mediator_protein.id < target_protein_obj.id:
-                protein_a_id = mediator_protein.id
-                protein_b_id = target_protein_obj.id
-                # mediator → target means a → b
-                direction = "a_to_b"
-            else:
-                protein_a_id = target_protein_obj.id
-                protein_b_id = mediator_protein.id
-                # mediator → target means b → a
-                direction = "b_to_a"
-
-            # Build interaction data
-            interaction_data_new = {
-                "primary": target_protein,
-                "direction": "main_to_primary",  # From mediator's perspective
-                "arrow": enriched_function.get("arrow", "activates"),
-                "interaction_type": "direct",
-                "function_context": "direct",
-                "functions": [enriched_function],
-                "evidence": enriched_function.get("evidence", []),
-                "pmids": enriched_function.get("pmids", []),
-                "confidence": enriched_function.get("confidence", 0.75),
-                "_inferred_from_chain": True,
-                "_enriched_by_script": True,
-                "_original_chain": f"{main_protein}→{mediator}→{target_protein}"
+            pending[key] = (row, [(function_name, enriched_function)])
+
+    now = run_started or utc_now()
+
+    # One SELECT for every pair that already has a row
+    existing_rows = Interaction.query.filter(
+        tuple_(Interaction.protein_a_id, Interaction.protein_b_id).in_(list(pending))
+    ).order_by(Interaction.id).all() if pending else []
+
+    for existing in existing_rows:
+        _, functions = pending.pop((existing.protein_a_id, existing.protein_b_id))
+        # Mutate the JSONB dict in place instead of copying it, then tell
+        # SQLAlchemy the column changed
+        for function_name, enriched_function in functions:
+            merge_enriched_function(existing.data, function_name, enriched_function)
+        flag_modified(existing, "data")
+        existing.interaction_type = "direct"
+        existing.function_context = "direct"
+        existing.updated_at = now
+
+    new_rows = []
+    for row, functions in pending.values():
+        for function_name, enriched_function in functions[1:]:
+            merge_enriched_function(row["data"], function_name, enriched_function)
+        new_rows.append(row)
+
+    # Insert in index order so B-tree pages are dirtied sequentially
+    new_rows.sort(key=lambda r: (r["protein_a_id"], r["protein_b_id"]))
+
+    if new_rows:
+        table = Interaction.__table__
+        stmt = pg_insert(table).values(new_rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.protein_a_id, table.c.protein_b_id],
+            set_={
+                "data": func.jsonb_set(
+                    table.c.data,
+                    "{functions}",
+                    func.coalesce(table.c.data["functions"], cast([], JSONB)).op("||")(
+                        stmt.excluded.data["functions"]
+                    )
+                ),
+                "interaction_type": stmt.excluded.interaction_type,
+                "function_context": stmt.excluded.function_context,
+                "updated_at": stmt.excluded.updated_at,
             }
+        )
+        db.session.execute(stmt)
 
-            if not dry_run:
-                # Create new Interaction record
-                new_interaction = Interaction(
-                    protein_a_id=protein_a_id,
-                    protein_b_id=protein_b_id,
-                    confidence=interaction_data_new.get("confidence", 0.75),
-                    direction=direction,
-                    arrow=enriched_function.get("arrow", "activates"),
-                    data=interaction_data_new,
-                    discovered_in_query=main_protein,
-                    discovery_method="mediator_pair_enrichment",
-                    interaction_type="direct",
-                    function_context="direct",
-                    upstream_interactor=None,
-                    mediator_chain=None,
-                    depth=1,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-
-                db.session.add(new_interaction)
-                db.session.commit()
-                print(f"    [CREATE] ✓ Created new interaction (ID: {new_interaction.id})")
-            else:
-                print(f"    [DRY-RUN] Would create new interaction")
+    db.session.commit()
+
+    return (len(existing_rows), len(new_rows))
+
+
+def load_protein_ids(symbols) -> Dict[str, int]:
+    """
+    Resolve protein symbols to IDs with a single IN (...) query.
+
+    Must be called inside an app context.
+    """
+    symbols = {s for s in symbols if s}
+    if not symbols:
+        return {}
+    rows = db.session.query(Protein.symbol, Protein.id).filter(Protein.symbol.in_(symbols)).all()
+    return {symbol: protein_id for symbol, protein_id in rows}
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_protein_id(symbol: str) -> int:
+    protein_id = db.session.query(Protein.id).filter_by(symbol=symbol).scalar()
+    if protein_id is None:
+        # Raising keeps misses out of the cache (the protein may be added later)
+        raise LookupError(symbol)
+    return protein_id
+
+
+def _protein_by_symbol(symbol: str) -> Optional[int]:
+    """
+    Return a protein's ID by symbol, memoized across calls.
+
+    Used when no preloaded symbol map is available. Must be called inside an app context.
+    """
+    try:
+        return _cached_protein_id(symbol)
+    except LookupError:
+        return None
+
+
+@dataclass(slots=True, frozen=True)
+class IxnView:
+    """Read-only view of one indirect interaction, parsed once at extraction time."""
+    id: int
+    main: str
+    partner: str
+    upstream: Optional[str]
+    chain: Tuple[str, ...]
+    functions: Tuple[Dict[str, Any], ...]
+
+    @property
+    def mediator(self) -> Optional[str]:
+        """The mediator adjacent to the target (upstream interactor or last chain hop)."""
+        return self.upstream or (self.chain[-1] if self.chain else None)
+
+
+async def process_all_indirect_interactions(
+    ixns: List[IxnView],
+    api_key: str,
+    verbose: bool = False,
+    dry_run: bool = True,
+    protein_ids: Optional[Dict[str, int]] = None,
+    run_started: Optional[datetime] = None,
+    use_cache: bool = True
+) -> List[Any]:
+    """
+    Run process_indirect_interaction for every interaction on one event loop.
+
+    Interactions sharing a (mediator, target, function_name) key are enriched
+    once and the result is fanned back out to each of them. At most
+    MAX_WORKERS Gemini requests are in flight at a time.
 
-    return enriched_function
+    Returns:
+        One entry per interaction: the queued op, None, or the raised exception
+    """
+    # Group interactions by the enrichment they need
+    groups: Dict[Tuple[Optional[str], str, str], List[int]] = {}
+    for idx, ixn in enumerate(ixns):
+        function_name, _ = extract_function_context(ixn.functions)
+        groups.setdefault((ixn.mediator, ixn.partner, function_name), []).append(idx)
+
+    if len(groups) < len(ixns):
+        print(f"[INFO] {len(ixns)} interactions share {len(groups)} unique mediator-target-function pairs")
+
+    semaphore = asyncio.Semaphore(MAX_WORKERS)
+    total = len(groups)
+    # One client per run: its async transport is bound to this event loop
+    client = google_genai.Client(api_key=api_key)
+
+    async def bounded(idx: int, ixn: IxnView):
+        async with semaphore:
+            print(f"\n[{idx+1}/{total}]")
+            return await process_indirect_interaction(
+                ixn,
+                api_key,
+                verbose=verbose,
+                dry_run=dry_run,
+                protein_ids=protein_ids,
+                run_started=run_started,
+                use_cache=use_cache,
+                client=client
+            )
+
+    indices = list(groups.values())
+    try:
+        group_results = await asyncio.gather(
+            *(bounded(n, ixns[members[0]]) for n, members in enumerate(indices)),
+            return_exceptions=True
+        )
+    finally:
+        await client.aio.aclose()
+
+    results: List[Any] = [None] * len(ixns)
+    for members, result in zip(indices, group_results):
+        for idx in members:
+            results[idx] = result
+    return results
 
 
 def enrich_protein_mediator_pairs(
@@ -502,6 +773,9 @@ def enrich_protein_mediator_pairs(
     """
     Enrich mediator-target pairs for a specific protein (programmatic interface).
 
+    Runs the same per-interaction enrichment as main() for the protein's
+    indirect interactions and writes the results with apply_enrichment_ops.
+
     Args:
         protein_symbol: Protein to process (e.g., "ATXN3")
         api_key: Google AI API key
@@ -530,52 +804,61 @@ def enrich_protein_mediator_pairs(
             print(f"[ENRICH] No indirect interactions found for {protein_symbol}", file=sys.stderr)
             return {"pairs_enriched": 0}
 
-        pairs_enriched = 0
+        # Load every target protein with one IN (...) query
+        target_ids = {
+            i.protein_b_id if i.protein_a_id == protein.id else i.protein_a_id
+            for i in interactions
+        }
+        targets = {p.id: p for p in Protein.query.filter(Protein.id.in_(target_ids)).all()}
 
+        ixns = []
         for interaction in interactions:
-            # Extract chain
-            mediator_chain = interaction.mediator_chain
-            if not mediator_chain or len(mediator_chain) == 0:
-                continue
-
-            # Get target protein
             target_protein_id = interaction.protein_b_id if interaction.protein_a_id == protein.id else interaction.protein_a_id
-            target_protein = db.session.get(Protein, target_protein_id)
-            if not target_protein:
+            target_protein = targets.get(target_protein_id)
+            functions = (interaction.data or {}).get("functions") or ()
+            if not interaction.mediator_chain or not target_protein or not functions:
                 continue
+            ixns.append(IxnView(
+                id=interaction.id,
+                main=protein_symbol,
+                partner=target_protein.symbol,
+                upstream=interaction.upstream_interactor,
+                chain=tuple(interaction.mediator_chain),
+                functions=tuple(functions)
+            ))
+
+        if not ixns:
+            return {"pairs_enriched": 0}
 
-            # Process each mediator-target pair
-            for mediator_symbol in mediator_chain:
-                # Get function context from interaction
-                functions = interaction.data.get("functions", [])
-                if not functions:
-                    continue
-
-                function_name = functions[0].get("function", "Unknown Function")
-                function_context = functions[0].get("biological_consequence", "")
-
-                # Enrich this pair
-                try:
-                    enriched_function = enrich_mediator_target_pair(
-                        mediator=mediator_symbol,
-                        target=target_protein.symbol,
-                        function_name=function_name,
-                        function_context=function_context,
-                        api_key=api_key,
-                        verbose=verbose,
-                        dry_run=dry_run
-                    )
-
-                    if enriched_function:
-                        pairs_enriched += 1
-
-                except Exception as e:
-                    if verbose:
-                        print(f"[ENRICH] Error enriching {mediator_symbol}→{target_protein.symbol}: {e}", file=sys.stderr)
-
-        db.session.commit()
-
-        return {"pairs_enriched": pairs_enriched}
+        protein_ids = {p.symbol: p.id for p in targets.values()}
+        protein_ids.update(load_protein_ids({ixn.mediator for ixn in ixns} - protein_ids.keys()))
+        run_started = utc_now()
+
+        # Enrich all pairs concurrently on one event loop
+        results = asyncio.run(process_all_indirect_interactions(
+            ixns,
+            api_key,
+            verbose=verbose,
+            dry_run=dry_run,
+            protein_ids=protein_ids,
+            run_started=run_started
+        ))
+
+        ops = []
+        queued = set()
+        for ixn, result in zip(ixns, results):
+            if isinstance(result, Exception):
+                if verbose:
+                    print(f"[ENRICH] Error enriching {ixn.mediator}→{ixn.partner}: {result}", file=sys.stderr)
+            elif result and id(result) not in queued:
+                # Deduplicated interactions share one op object; queue it once
+                queued.add(id(result))
+                ops.append(result)
+
+        if ops and not dry_run:
+            apply_enrichment_ops(ops, run_started=run_started)
+
+        return {"pairs_enriched": len(ops)}
 
 
 def main():
@@ -584,6 +867,7 @@ def main():
     parser.add_argument("--protein", type=str, help="Only process specific protein's indirect interactions")
     parser.add_argument("--limit", type=int, help="Limit number of pairs to process")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the on-disk Gemini pair cache")
     args = parser.parse_args()
 
     # Load environment
@@ -593,6 +877,9 @@ def main():
         print("[ERROR] GOOGLE_API_KEY not set in environment")
         sys.exit(1)
 
+    # One timestamp for every enrichment and row written by this run
+    run_started = utc_now()
+
     mode = "DRY RUN" if args.dry_run else "LIVE"
     print(f"\n{'='*80}")
     print(f"MEDIATOR-PAIR FUNCTION ENRICHMENT ({mode})")
@@ -600,79 +887,113 @@ def main():
 
     # Query indirect interactions
     with app.app_context():
-        query = Interaction.query.filter_by(interaction_type="indirect")
+        # Read-only Core select: endpoint symbols come from a join, and rows
+        # come back as tuples instead of instrumented ORM objects
+        protein_a = aliased(Protein)
+        protein_b = aliased(Protein)
+        stmt = (
+            select(
+                Interaction.id,
+                Interaction.data,
+                Interaction.upstream_interactor,
+                Interaction.mediator_chain,
+                Interaction.discovered_in_query,
+                protein_a.id.label("a_id"),
+                protein_a.symbol.label("a_symbol"),
+                protein_b.id.label("b_id"),
+                protein_b.symbol.label("b_symbol"),
+            )
+            .join(protein_a, Interaction.protein_a_id == protein_a.id)
+            .join(protein_b, Interaction.protein_b_id == protein_b.id)
+            .where(Interaction.interaction_type == "indirect")
+        )
 
         if args.protein:
             protein = Protein.query.filter_by(symbol=args.protein).first()
             if not protein:
                 print(f"[ERROR] Protein '{args.protein}' not found")
                 sys.exit(1)
-            query = query.filter(
+            stmt = stmt.where(
                 (Interaction.protein_a_id == protein.id) |
                 (Interaction.protein_b_id == protein.id)
             )
             print(f"[INFO] Filtering to protein: {args.protein}")
 
         if args.limit:
-            query = query.limit(args.limit)
+            stmt = stmt.limit(args.limit)
             print(f"[INFO] Limiting to {args.limit} interactions")
 
-        interactions = query.all()
-
-        if not interactions:
+        # Extract data: a server-side cursor fetches 500 rows at a time, so
+        # only the compact IxnViews (not every raw JSONB row) are held at once
+        ixns = []
+        protein_ids = {}
+        result = db.session.execute(stmt, execution_options={"stream_results": True, "yield_per": 500})
+        for row in result:
+            protein_ids[row.a_symbol] = row.a_id
+            protein_ids[row.b_symbol] = row.b_id
+
+            main_protein = row.discovered_in_query or row.a_symbol
+            partner_protein = row.b_symbol if main_protein == row.a_symbol else row.a_symbol
+
+            ixns.append(IxnView(
+                id=row.id,
+                main=main_protein,
+                partner=partner_protein,
+                upstream=row.upstream_interactor,
+                chain=tuple(row.mediator_chain or ()),
+                functions=tuple((row.data or {}).get("functions") or ())
+            ))
+
+        if not ixns:
             print("[INFO] No indirect interactions found")
             sys.exit(0)
 
-        print(f"[INFO] Found {len(interactions)} indirect interactions to process\n")
-
-        # Extract data
-        interaction_data_list = []
-        for interaction in interactions:
-            protein_a = db.session.get(Protein, interaction.protein_a_id)
-            protein_b = db.session.get(Protein, interaction.protein_b_id)
-
-            main_protein = interaction.discovered_in_query or protein_a.symbol
-            partner_protein = protein_b.symbol if main_protein == protein_a.symbol else protein_a.symbol
-
-            interaction_data_list.append({
-                "id": interaction.id,
-                "data": interaction.data,
-                "main_protein": main_protein,
-                "partner_protein": partner_protein,
-                "upstream_interactor": interaction.upstream_interactor,
-                "mediator_chain": interaction.mediator_chain or [],
-                "interaction_type": "indirect"
-            })
-
-        # Process each indirect interaction
-        enriched_count = 0
-        failed_count = 0
+        print(f"[INFO] Found {len(ixns)} indirect interactions to process\n")
 
-        for idx, interaction_data in enumerate(interaction_data_list):
-            print(f"\n[{idx+1}/{len(interaction_data_list)}]")
+        # Resolve every mediator and target symbol up front so the workers
+        # do dict lookups instead of two Protein queries each
+        needed_symbols = {ixn.mediator for ixn in ixns} - protein_ids.keys()
+        protein_ids.update(load_protein_ids(needed_symbols))
 
-            try:
-                result = process_indirect_interaction(
-                    interaction_data,
-                    api_key,
-                    verbose=args.verbose,
-                    dry_run=args.dry_run
-                )
+        # Process indirect interactions concurrently (bounded by MAX_WORKERS)
+        results = asyncio.run(process_all_indirect_interactions(
+            ixns,
+            api_key,
+            verbose=args.verbose,
+            dry_run=args.dry_run,
+            protein_ids=protein_ids,
+            run_started=run_started,
+            use_cache=not args.no_cache
+        ))
 
-                if result:
-                    enriched_count += 1
-                else:
-                    failed_count += 1
+        enriched_count = 0
+        failed_count = 0
+        ops = []
+        queued = set()
 
-            except Exception as e:
-                print(f"  [ERROR] Failed: {e}")
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"  [ERROR] Failed: {result}")
+                failed_count += 1
+            elif result:
+                enriched_count += 1
+                # Deduplicated interactions share one op object; queue it once
+                if id(result) not in queued:
+                    queued.add(id(result))
+                    ops.append(result)
+            else:
                 failed_count += 1
 
+        # Write every enrichment in a single transaction
+        if ops and not args.dry_run:
+            updated_count, created_count = apply_enrichment_ops(ops, run_started=run_started)
+            print(f"\n[INFO] Committed {updated_count} updated and {created_count} new interactions")
+
         # Summary
         print(f"\n{'='*80}")
         print(f"ENRICHMENT COMPLETE")
         print(f"{'='*80}")
-        print(f"Total processed: {len(interaction_data_list)}")
+        print(f"Total processed: {len(ixns)}")
         print(f"Successfully enriched: {enriched_count}")
         print(f"Failed: {failed_count}")
 
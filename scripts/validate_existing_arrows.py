@@ -33,24 +33,41 @@ Usage:
 """
 
 import os
+import re
 import sys
 import json
+import itertools
+import functools
+import asyncio
 import argparse
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
+from sqlalchemy import bindparam, case, cast, event, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import aliased
 from models import db, Protein, Interaction
 from app import app  # Import Flask app for database context
 
 # Import arrow validator
 try:
-    from utils.arrow_effect_validator import validate_single_interaction
+    from google import genai as google_genai
+    from utils.arrow_effect_validator import (
+        validate_single_interaction,
+        validate_interactions_batch_async,
+        DEFAULT_BATCH_SIZE,
+        VALIDATION_CACHE_DIR,
+    )
     VALIDATOR_AVAILABLE = True
 except ImportError:
     VALIDATOR_AVAILABLE = False
@@ -59,7 +76,15 @@ except ImportError:
 
 
 # Constants
-MAX_WORKERS = 12
+GEMINI_RPM = 24  # Gemini requests/minute budgeted for this script
+AVG_CALL_LATENCY_SEC = 30  # Typical validation call (thinking + search)
+# Calls in flight that keep us at GEMINI_RPM (Little's law: rate x latency)
+MAX_WORKERS = max(1, min(32, GEMINI_RPM * AVG_CALL_LATENCY_SEC // 60))
+COMMIT_CHUNK_SIZE = 200  # Staged corrections per database commit
+# Serializes DB writes across threads (writer thread, main thread); one
+# writer at a time also avoids the SQLite fallback's single-writer lock
+# timeouts. Reentrant because apply_corrections_to_db wraps stage_corrections.
+DB_WRITE_LOCK = threading.RLock()
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
@@ -85,11 +110,17 @@ def deduplicate_functions(functions: List[Dict[str, Any]]) -> List[Dict[str, Any
     if not functions:
         return []
 
-    # Group by (function_name, function_context) tuple
+    # Group by (function_name, function_context) tuple.
+    # Each entry keeps its validated flag next to the dict, and its
+    # completeness score once computed, so neither is recomputed per comparison
+    # (and no helper keys leak into the stored function dicts).
     seen = {}
 
+    def completeness(f):
+        return sum(1 for v in f.values() if v not in (None, "", []))
+
     for func in functions:
-        func_name = (func.get("function", "") or "").strip().lower()
+        func_name = (func.get("function", "") or "").strip().casefold()
         if not func_name:
             continue
 
@@ -97,62 +128,216 @@ def deduplicate_functions(functions: List[Dict[str, Any]]) -> List[Dict[str, Any
         func_context = func.get("function_context") or "unknown"
         key = (func_name, func_context)
 
-        if key in seen:
-            existing = seen[key]
+        is_validated = func.get("arrow_context") is not None or func.get("direct_arrow") is not None
 
-            # Check validation flags
-            is_validated = func.get("arrow_context") is not None or func.get("direct_arrow") is not None
-            existing_validated = existing.get("arrow_context") is not None or existing.get("direct_arrow") is not None
+        entry = seen.get(key)
+        if entry is None:
+            seen[key] = [func, is_validated, None]
+            continue
 
-            # RULE 1: Validated entries ALWAYS replace non-validated
-            if is_validated and not existing_validated:
-                seen[key] = func  # REPLACE
-            elif existing_validated and not is_validated:
-                pass  # Keep existing
-            else:
-                # Both validated or both non-validated: prefer more complete
-                existing_fields = sum(1 for v in existing.values() if v not in [None, "", []])
-                current_fields = sum(1 for v in func.values() if v not in [None, "", []])
+        existing, existing_validated, existing_fields = entry
 
-                if current_fields > existing_fields:
-                    seen[key] = func
-        else:
-            seen[key] = func
+        # RULE 1: Validated entries ALWAYS replace non-validated
+        if is_validated != existing_validated:
+            if is_validated:
+                seen[key] = [func, is_validated, None]  # REPLACE
+            continue
+
+        # Both validated or both non-validated: prefer more complete
+        if existing_fields is None:
+            existing_fields = entry[2] = completeness(existing)
+        current_fields = completeness(func)
+
+        if current_fields > existing_fields:
+            seen[key] = [func, is_validated, current_fields]
+
+    return [entry[0] for entry in seen.values()]
+
+
+def preload_direct_pair_index(
+    interaction_data_list: List[Dict[str, Any]]
+) -> Tuple[Dict[str, Protein], Dict[Tuple[int, int], Tuple[int, str]]]:
+    """
+    Loads every mediator/target protein and an index of existing mediator-target
+    interactions needed for Phase 2 with two IN (...) queries.
+
+    Only ids and interaction types are loaded for the pair index; the full
+    Interaction row (and its JSONB payload) is fetched lazily on a hit.
+
+    Args:
+        interaction_data_list: Interaction data dicts (indirect ones are used)
+
+    Returns:
+        (proteins_by_symbol, interactions_by_pair) where interactions_by_pair maps
+        canonical (protein_a_id, protein_b_id) tuples to (interaction_id, interaction_type)
+    """
+    symbol_pairs = set()
+    for interaction_data in interaction_data_list:
+        if interaction_data.get("interaction_type") != "indirect":
+            continue
+        mediator_chain = interaction_data.get("mediator_chain") or []
+        mediator = interaction_data.get("upstream_interactor") or (mediator_chain[-1] if mediator_chain else None)
+        if mediator:
+            symbol_pairs.add((mediator, interaction_data["partner_protein"]))
+
+    symbols = {symbol for pair in symbol_pairs for symbol in pair}
+    if not symbols:
+        return {}, {}
+
+    proteins_by_symbol = {
+        p.symbol: p for p in Protein.query.filter(Protein.symbol.in_(symbols)).all()
+    }
+
+    id_pairs = set()
+    for mediator, target in symbol_pairs:
+        mediator_protein = proteins_by_symbol.get(mediator)
+        target_protein = proteins_by_symbol.get(target)
+        if mediator_protein and target_protein:
+            id_pairs.add(tuple(sorted((mediator_protein.id, target_protein.id))))
+
+    interactions_by_pair = {}
+    if id_pairs:
+        # Same default as check_existing_direct_interaction: a missing type means direct
+        data_type = func.coalesce(Interaction.data["interaction_type"].astext, "direct")
+        rows = db.session.query(
+            Interaction.id, Interaction.protein_a_id, Interaction.protein_b_id, data_type
+        ).filter(
+            tuple_(Interaction.protein_a_id, Interaction.protein_b_id).in_(list(id_pairs))
+        )
+        for interaction_id, protein_a_id, protein_b_id, interaction_type in rows:
+            interactions_by_pair[(protein_a_id, protein_b_id)] = (interaction_id, interaction_type)
+
+    return proteins_by_symbol, interactions_by_pair
+
+
+def preload_pair_interactions(
+    interactions_by_pair: Dict[Tuple[int, int], Tuple[int, str]]
+) -> List[Interaction]:
+    """
+    Loads every Interaction row in the pair index with one IN (...) query.
+
+    The caller must hold on to the returned list: while these rows stay in the
+    session's identity map, lookup_pair and check_existing_direct_interaction
+    resolve hits with db.session.get() without a SELECT per pair.
+
+    Args:
+        interactions_by_pair: Index returned by preload_direct_pair_index
+
+    Returns:
+        The loaded Interaction rows
+    """
+    interaction_ids = {interaction_id for interaction_id, _ in interactions_by_pair.values()}
+    if not interaction_ids:
+        return []
+    return Interaction.query.filter(Interaction.id.in_(interaction_ids)).all()
+
+
+def _resolve_pair(
+    mediator: str,
+    target: str,
+    proteins_by_symbol: Dict[str, Protein],
+    interactions_by_pair: Dict[Tuple[int, int], Tuple[int, str]]
+) -> Tuple[Optional[Protein], Optional[Protein], Optional[Tuple[int, str]]]:
+    """Resolves symbols through the preloaded maps without touching the database."""
+    mediator_protein = proteins_by_symbol.get(mediator)
+    target_protein = proteins_by_symbol.get(target)
+    if not mediator_protein or not target_protein:
+        return mediator_protein, target_protein, None
+    key = tuple(sorted((mediator_protein.id, target_protein.id)))
+    return mediator_protein, target_protein, interactions_by_pair.get(key)
+
+
+# Direction as seen from the other end of a pair stored in canonical order
+FLIPPED_DIRECTION = {
+    "main_to_primary": "primary_to_main",
+    "primary_to_main": "main_to_primary",
+}
+
+
+def canonical_ids(protein_a: Protein, protein_b: Protein) -> Tuple[int, int, bool]:
+    """
+    Orders two proteins the way interactions are stored (protein_a_id < protein_b_id).
+
+    Returns:
+        (protein_a_id, protein_b_id, flipped) where flipped is True if the inputs were swapped
+    """
+    if protein_a.id < protein_b.id:
+        return protein_a.id, protein_b.id, False
+    return protein_b.id, protein_a.id, True
+
+
+# Per-pair lookups for when no preloaded index is given; built once so each
+# call only binds parameters against SQLAlchemy's cached compilation
+_PROTEIN_BY_SYMBOL = select(Protein).where(Protein.symbol == bindparam("symbol")).limit(1)
+_INTERACTION_BY_PAIR = select(Interaction).where(
+    Interaction.protein_a_id == bindparam("a"),
+    Interaction.protein_b_id == bindparam("b")
+).limit(1)
+
+
+def lookup_pair(
+    mediator: str,
+    target: str,
+    proteins_by_symbol: Optional[Dict[str, Protein]] = None,
+    interactions_by_pair: Optional[Dict[Tuple[int, int], Tuple[int, str]]] = None
+) -> Tuple[Optional[Protein], Optional[Protein], Optional[Interaction]]:
+    """
+    Resolves a mediator-target pair to its proteins and any existing interaction.
+
+    Uses the preloaded maps from preload_direct_pair_index when given,
+    otherwise queries the database.
+
+    Returns:
+        (mediator_protein, target_protein, existing_interaction)
+    """
+    if proteins_by_symbol is not None and interactions_by_pair is not None:
+        mediator_protein, target_protein, entry = _resolve_pair(
+            mediator, target, proteins_by_symbol, interactions_by_pair
+        )
+        existing = db.session.get(Interaction, entry[0]) if entry else None
+        return mediator_protein, target_protein, existing
+
+    mediator_protein = db.session.execute(_PROTEIN_BY_SYMBOL, {"symbol": mediator}).scalars().first()
+    target_protein = db.session.execute(_PROTEIN_BY_SYMBOL, {"symbol": target}).scalars().first()
+
+    if not mediator_protein or not target_protein:
+        return mediator_protein, target_protein, None
+
+    # Check canonical ordering (protein_a_id < protein_b_id)
+    lo, hi = sorted((mediator_protein.id, target_protein.id))
+    existing = db.session.execute(_INTERACTION_BY_PAIR, {"a": lo, "b": hi}).scalars().first()
 
-    return list(seen.values())
+    return mediator_protein, target_protein, existing
 
 
 def check_existing_direct_interaction(
     mediator: str,
-    target: str
+    target: str,
+    proteins_by_symbol: Optional[Dict[str, Protein]] = None,
+    interactions_by_pair: Optional[Dict[Tuple[int, int], Tuple[int, str]]] = None
 ) -> Optional[Interaction]:
     """
     Query database for existing direct interaction between two proteins.
 
+    With the preloaded maps this is a dict membership test; the Interaction
+    row is only fetched when a direct interaction exists.
+
     Args:
         mediator: First protein symbol
         target: Second protein symbol
+        proteins_by_symbol: Preloaded symbol -> Protein map (queried if None)
+        interactions_by_pair: Preloaded canonical pair -> (id, type) index (queried if None)
 
     Returns:
         Interaction ORM object if found with interaction_type='direct', else None
     """
-    mediator_protein = Protein.query.filter_by(symbol=mediator).first()
-    target_protein = Protein.query.filter_by(symbol=target).first()
-
-    if not mediator_protein or not target_protein:
+    if proteins_by_symbol is not None and interactions_by_pair is not None:
+        _, _, entry = _resolve_pair(mediator, target, proteins_by_symbol, interactions_by_pair)
+        if entry and entry[1] == 'direct':
+            return db.session.get(Interaction, entry[0])
         return None
 
-    # Check canonical ordering (protein_a_id < protein_b_id)
-    if mediator_protein.id < target_protein.id:
-        existing = db.session.query(Interaction).filter(
-            Interaction.protein_a_id == mediator_protein.id,
-            Interaction.protein_b_id == target_protein.id
-        ).first()
-    else:
-        existing = db.session.query(Interaction).filter(
-            Interaction.protein_a_id == target_protein.id,
-            Interaction.protein_b_id == mediator_protein.id
-        ).first()
+    _, _, existing = lookup_pair(mediator, target)
 
     # Only return if it's a direct interaction (not indirect/shared)
     if existing:
@@ -163,6 +348,12 @@ def check_existing_direct_interaction(
     return None
 
 
+@functools.lru_cache(maxsize=8192)
+def _lowered_evidence_text(title: str, quote: str) -> Tuple[str, str]:
+    """Lowercase an evidence title/quote once; the same papers recur across chains."""
+    return title.lower(), quote.lower()
+
+
 def extract_direct_link_evidence(
     indirect_data: Dict[str, Any],
     mediator: str,
@@ -183,13 +374,15 @@ def extract_direct_link_evidence(
     evidence = indirect_data.get("evidence", [])
     relevant_evidence = []
 
+    mediator_lower = mediator.lower()
+    target_lower = target.lower()
+
     for ev in evidence:
         # Check if this paper discusses the mediator→target relationship
-        title = (ev.get("paper_title", "") or "").lower()
-        quote = (ev.get("relevant_quote", "") or "").lower()
-
-        mediator_lower = mediator.lower()
-        target_lower = target.lower()
+        title, quote = _lowered_evidence_text(
+            ev.get("paper_title", "") or "",
+            ev.get("relevant_quote", "") or ""
+        )
 
         # Simple heuristic: both proteins mentioned in title or quote
         if (mediator_lower in title and target_lower in title) or \
@@ -205,6 +398,12 @@ def extract_direct_link_evidence(
     return None
 
 
+@functools.lru_cache(maxsize=1024)
+def _pair_mention_pattern(protein_a: str, protein_b: str) -> re.Pattern:
+    """Compile one case-insensitive whole-word alternation for a protein pair."""
+    return re.compile(rf'\b({re.escape(protein_a)}|{re.escape(protein_b)})\b', re.IGNORECASE)
+
+
 def validate_pair_specific_evidence(
     evidence: List[Dict[str, Any]],
     protein_a: str,
@@ -224,20 +423,21 @@ def validate_pair_specific_evidence(
     if not evidence:
         return (False, [])
 
-    protein_a_lower = protein_a.lower()
-    protein_b_lower = protein_b.lower()
+    pattern = _pair_mention_pattern(protein_a, protein_b)
+    wanted = {protein_a.upper(), protein_b.upper()}
 
     pair_specific = []
 
     for ev in evidence:
-        title = (ev.get('paper_title') or '').lower()
-        quote = (ev.get('relevant_quote') or '').lower()
+        title = ev.get('paper_title') or ''
+        quote = ev.get('relevant_quote') or ''
 
-        # Both proteins must be mentioned in title OR quote
-        a_mentioned = protein_a_lower in title or protein_a_lower in quote
-        b_mentioned = protein_b_lower in title or protein_b_lower in quote
+        # Both proteins must be mentioned (as whole words) in title OR quote
+        mentioned = {m.group(1).upper() for m in pattern.finditer(title)}
+        if not wanted <= mentioned:
+            mentioned.update(m.group(1).upper() for m in pattern.finditer(quote))
 
-        if a_mentioned and b_mentioned:
+        if wanted <= mentioned:
             pair_specific.append(ev)
 
     return (len(pair_specific) > 0, pair_specific)
@@ -360,7 +560,10 @@ def process_indirect_interaction(
     interaction_data: Dict[str, Any],
     db_interactions_map: Dict[int, Any],
     verbose: bool = False,
-    api_key: str = None
+    api_key: str = None,
+    proteins_by_symbol: Optional[Dict[str, Protein]] = None,
+    interactions_by_pair: Optional[Dict[Tuple[int, int], Tuple[int, str]]] = None,
+    aggressive: bool = False
 ) -> Optional[Dict[str, Any]]:
     """
     Processes an indirect interaction to extract direct mediator link using 3-tier strategy.
@@ -368,6 +571,7 @@ def process_indirect_interaction(
     For indirect chain like ATXN3→VCP→UFD1:
     - Tier 1: Check if VCP→UFD1 already exists in database as direct
     - Tier 2: Query pipeline for VCP to find UFD1 direct interaction
+      (skipped unless aggressive when no chain paper names both proteins)
     - Tier 3: Extract from chain evidence (fallback)
 
     Args:
@@ -375,6 +579,9 @@ def process_indirect_interaction(
         db_interactions_map: Map of interaction_id → ORM object
         verbose: Enable detailed logging
         api_key: Google API key for Tier 2 pipeline queries
+        proteins_by_symbol: Preloaded symbol -> Protein map for Tier 1 (queried if None)
+        interactions_by_pair: Preloaded canonical pair -> (id, type) index for Tier 1 (queried if None)
+        aggressive: Run Tier 2 even when the chain evidence never names both proteins
 
     Returns:
         Dict with direct link data for validation, or None
@@ -403,7 +610,12 @@ def process_indirect_interaction(
     # ========================================
     # TIER 1: Check existing database for direct interaction
     # ========================================
-    existing = check_existing_direct_interaction(mediator, target_protein)
+    existing = check_existing_direct_interaction(
+        mediator,
+        target_protein,
+        proteins_by_symbol,
+        interactions_by_pair
+    )
     if existing:
         if verbose:
             print(f"    [TIER 1] Found existing direct interaction in database (ID: {existing.id})")
@@ -426,7 +638,21 @@ def process_indirect_interaction(
     # ========================================
     # TIER 2: Query pipeline for direct pair
     # ========================================
-    if api_key:
+    run_tier2 = bool(api_key)
+    if run_tier2 and not aggressive:
+        # Cheap pre-scan: a pipeline run is rarely fruitful when no paper in
+        # the chain evidence mentions both mediator and target
+        has_chain_evidence, _ = validate_pair_specific_evidence(
+            data.get("evidence", []),
+            mediator,
+            target_protein
+        )
+        if not has_chain_evidence:
+            run_tier2 = False
+            if verbose:
+                print(f"    [TIER 2] Skipped: no chain evidence names both {mediator} and {target_protein}")
+
+    if run_tier2:
         pipeline_result = query_direct_interaction_pair(
             mediator,
             target_protein,
@@ -498,10 +724,70 @@ def process_indirect_interaction(
     }
 
 
+def build_interactor_for_validation(interaction_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds the interactor object the arrow validator expects from a record dict.
+
+    Args:
+        interaction_data: Dict with interaction data (not ORM object)
+
+    Returns:
+        Interactor dict for validation
+    """
+    data = interaction_data["data"]
+    return {
+        "primary": interaction_data["partner_protein"],
+        "direction": data.get("direction", "unknown"),
+        "arrow": data.get("arrow", "unknown"),
+        "interaction_type": data.get("interaction_type", "direct"),
+        "functions": data.get("functions", []),
+        "evidence": data.get("evidence", []),
+        "_original_direction": data.get("_original_direction"),
+        # Chain fields for indirect interactions (from table columns)
+        "upstream_interactor": interaction_data.get("upstream_interactor"),
+        "mediator_chain": interaction_data.get("mediator_chain", []),
+        "depth": interaction_data.get("depth", 1),
+    }
+
+
+def build_correction_record(
+    interaction_data: Dict[str, Any],
+    interactor: Dict[str, Any],
+    corrected: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Wraps a validator result into a correction record, or None if nothing changed.
+
+    Args:
+        interaction_data: Dict with interaction data (not ORM object)
+        interactor: Interactor dict sent to the validator
+        corrected: Validator output for that interactor
+
+    Returns:
+        Dict with corrections or None if no changes needed
+    """
+    # Check if corrections were applied
+    validation_metadata = corrected.get("_validation_metadata", {})
+    corrections_count = validation_metadata.get("corrections_applied", 0)
+
+    if corrections_count > 0:
+        return {
+            "interaction_id": interaction_data["id"],
+            "main_protein": interaction_data["main_protein"],
+            "partner_protein": interaction_data["partner_protein"],
+            "original_data": interactor,
+            "corrected_data": corrected,
+            "corrections_count": corrections_count
+        }
+
+    return None
+
+
 def validate_interaction_record(
     interaction_data: Dict[str, Any],
     api_key: str,
-    verbose: bool = False
+    verbose: bool = False,
+    use_cache: bool = True
 ) -> Optional[Dict[str, Any]]:
     """
     Validates a single database interaction record.
@@ -510,105 +796,159 @@ def validate_interaction_record(
         interaction_data: Dict with interaction data (not ORM object)
         api_key: Google AI API key
         verbose: Enable detailed logging
+        use_cache: Reuse/store the validator's cached corrections (VALIDATION_CACHE_DIR)
 
     Returns:
         Dict with corrections or None if no changes needed
     """
     try:
-        # Extract pre-fetched data
-        interaction_id = interaction_data["id"]
-        data = interaction_data["data"]
-        main_protein = interaction_data["main_protein"]
-        partner_protein = interaction_data["partner_protein"]
-
         # Build interactor object for validation
-        interactor = {
-            "primary": partner_protein,
-            "direction": data.get("direction", "unknown"),
-            "arrow": data.get("arrow", "unknown"),
-            "interaction_type": data.get("interaction_type", "direct"),
-            "functions": data.get("functions", []),
-            "evidence": data.get("evidence", []),
-            "_original_direction": data.get("_original_direction"),
-            # Chain fields for indirect interactions (from table columns)
-            "upstream_interactor": interaction_data.get("upstream_interactor"),
-            "mediator_chain": interaction_data.get("mediator_chain", []),
-            "depth": interaction_data.get("depth", 1),
-        }
+        interactor = build_interactor_for_validation(interaction_data)
 
         # Validate
         corrected = validate_single_interaction(
             interactor,
-            main_protein,
+            interaction_data["main_protein"],
             api_key,
-            verbose=verbose
+            verbose=verbose,
+            use_cache=use_cache
         )
 
-        # Check if corrections were applied
-        validation_metadata = corrected.get("_validation_metadata", {})
-        corrections_count = validation_metadata.get("corrections_applied", 0)
-
-        if corrections_count > 0:
-            return {
-                "interaction_id": interaction_id,
-                "main_protein": main_protein,
-                "partner_protein": partner_protein,
-                "original_data": interactor,
-                "corrected_data": corrected,
-                "corrections_count": corrections_count
-            }
+        return build_correction_record(interaction_data, interactor, corrected)
 
+    except Exception as e:
+        print(f"[ERROR] Failed to validate interaction {interaction_data.get('id')}: {e}")
         return None
 
+
+async def validate_interaction_records_batch_async(
+    batch: List[Dict[str, Any]],
+    client: "google_genai.Client",
+    verbose: bool = False,
+    use_cache: bool = True
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Validates a slice of database interaction records with one async Gemini call.
+
+    Records with cached corrections in the validator's VALIDATION_CACHE_DIR
+    are answered from the cache and left out of the Gemini call.
+
+    Args:
+        batch: Dicts with interaction data (not ORM objects)
+        client: Gemini client created on the running event loop
+        verbose: Enable detailed logging
+        use_cache: Reuse/store the validator's cached corrections (VALIDATION_CACHE_DIR)
+
+    Returns:
+        One correction dict (or None if no changes needed) per record, in order
+    """
+    try:
+        interactors = [build_interactor_for_validation(d) for d in batch]
+        corrected_list = await validate_interactions_batch_async(
+            interactors,
+            [d["main_protein"] for d in batch],
+            client,
+            verbose=verbose,
+            use_cache=use_cache
+        )
+        return [
+            build_correction_record(d, interactor, corrected)
+            for d, interactor, corrected in zip(batch, interactors, corrected_list)
+        ]
+
     except Exception as e:
-        print(f"[ERROR] Failed to validate interaction {interaction_id}: {e}")
-        return None
+        ids = ", ".join(str(d.get("id")) for d in batch)
+        print(f"[ERROR] Failed to validate interactions [{ids}]: {e}")
+        return [None] * len(batch)
 
 
-def invalidate_cache_files(main_protein: str, partner_protein: str, verbose: bool = False) -> bool:
+def build_pruned_cache_index(pruned_dir: Path = Path("cache") / "pruned") -> Dict[str, List[Path]]:
     """
-    Invalidates (deletes) cache files for proteins after database update.
+    Lists the pruned cache directory once and indexes its files by protein symbol.
 
-    This ensures the visualization will fetch fresh data from the database
-    instead of reading stale cached files.
+    Pruned cache files are named <PARENT>_for_<PROTEIN>.json, so each file is
+    indexed under both symbols.
 
     Args:
-        main_protein: Main protein symbol (e.g., "ATXN3")
-        partner_protein: Partner protein symbol (e.g., "VCP")
+        pruned_dir: Pruned cache directory
+
+    Returns:
+        Dict mapping protein symbol -> pruned cache files naming it
+    """
+    index = defaultdict(list)
+    try:
+        entries = os.scandir(pruned_dir)
+    except FileNotFoundError:
+        return index
+
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            path = Path(entry.path)
+            for symbol in set(entry.name[:-len(".json")].split("_for_")):
+                index[symbol].append(path)
+
+    return index
+
+
+def invalidate_protein_caches(
+    proteins,
+    verbose: bool = False,
+    pruned_index: Optional[Dict[str, List[Path]]] = None
+) -> bool:
+    """
+    Invalidates (deletes) the cache files of a set of proteins in one pass.
+
+    Args:
+        proteins: Protein symbols whose caches are stale
         verbose: Enable detailed logging
+        pruned_index: Index from build_pruned_cache_index; when given, pruned
+            files are looked up in it instead of scanning cache/pruned
 
     Returns:
         True if successful
     """
+    proteins = set(proteins)
+    if not proteins:
+        return True
+
     try:
         cache_dir = Path("cache")
         pruned_dir = cache_dir / "pruned"
 
         deleted_count = 0
 
-        # Delete main protein cache
-        main_cache = cache_dir / f"{main_protein}.json"
-        if main_cache.exists():
-            main_cache.unlink()
-            deleted_count += 1
-            if verbose:
-                print(f"    [CACHE] Deleted {main_cache}")
-
-        # Delete partner protein cache (in case it was queried)
-        partner_cache = cache_dir / f"{partner_protein}.json"
-        if partner_cache.exists():
-            partner_cache.unlink()
-            deleted_count += 1
-            if verbose:
-                print(f"    [CACHE] Deleted {partner_cache}")
+        # Delete each protein's full cache
+        for protein in proteins:
+            protein_cache = cache_dir / f"{protein}.json"
+            if protein_cache.exists():
+                protein_cache.unlink()
+                deleted_count += 1
+                if verbose:
+                    print(f"    [CACHE] Deleted {protein_cache}")
 
         # Delete pruned caches involving these proteins
-        if pruned_dir.exists():
+        if pruned_index is not None:
+            # Files are removed from the index as they go; a file indexed under
+            # both symbols may already be gone when its other symbol comes up
+            pruned_files = dict.fromkeys(
+                path for protein in proteins for path in pruned_index.pop(protein, [])
+            )
+            for pruned_file in pruned_files:
+                try:
+                    pruned_file.unlink()
+                except FileNotFoundError:
+                    continue
+                deleted_count += 1
+                if verbose:
+                    print(f"    [CACHE] Deleted {pruned_file}")
+        elif pruned_dir.exists():
             # Pattern: <PARENT>_for_<PROTEIN>.json
             for pruned_file in pruned_dir.glob("*.json"):
                 filename = pruned_file.stem
-                # Check if either protein is mentioned in filename
-                if main_protein in filename or partner_protein in filename:
+                # Check if any protein is mentioned in filename
+                if any(protein in filename for protein in proteins):
                     pruned_file.unlink()
                     deleted_count += 1
                     if verbose:
@@ -624,13 +964,41 @@ def invalidate_cache_files(main_protein: str, partner_protein: str, verbose: boo
         return False
 
 
-def apply_corrections_to_db(
+def invalidate_cache_files(
+    main_protein: str,
+    partner_protein: str,
+    verbose: bool = False,
+    pruned_index: Optional[Dict[str, List[Path]]] = None
+) -> bool:
+    """
+    Invalidates (deletes) cache files for proteins after database update.
+
+    This ensures the visualization will fetch fresh data from the database
+    instead of reading stale cached files.
+
+    Args:
+        main_protein: Main protein symbol (e.g., "ATXN3")
+        partner_protein: Partner protein symbol (e.g., "VCP")
+        verbose: Enable detailed logging
+        pruned_index: Index from build_pruned_cache_index; when given, pruned
+            files are looked up in it instead of scanning cache/pruned
+
+    Returns:
+        True if successful
+    """
+    return invalidate_protein_caches((main_protein, partner_protein), verbose, pruned_index)
+
+
+def stage_corrections(
     interaction: Interaction,
     corrected_data: Dict[str, Any],
     dry_run: bool = True
 ) -> bool:
     """
-    Applies corrections to database record.
+    Stages corrections for a database record without committing.
+
+    The UPDATE runs inside a savepoint, so a failing row is rolled back on its
+    own and leaves other staged rows in the open transaction untouched.
 
     Args:
         interaction: Interaction ORM object
@@ -641,56 +1009,317 @@ def apply_corrections_to_db(
         True if successful
     """
     try:
-        # Merge corrections into existing data
-        data = interaction.data.copy()
-
-        # Update interaction-level fields
-        data["direction"] = corrected_data.get("direction", data.get("direction"))
-        data["arrow"] = corrected_data.get("arrow", data.get("arrow"))
-        data["interaction_type"] = corrected_data.get("interaction_type", data.get("interaction_type"))
+        # Only the top-level keys below change, so build just those instead of
+        # copying the whole payload (evidence arrays can be large)
+        data = interaction.data or {}
+        patch = {
+            # Update interaction-level fields
+            "direction": corrected_data.get("direction", data.get("direction")),
+            "arrow": corrected_data.get("arrow", data.get("arrow")),
+            "interaction_type": corrected_data.get("interaction_type", data.get("interaction_type")),
+        }
 
-        # Update functions and deduplicate
+        # Update functions and deduplicate (prefer validated entries)
         corrected_functions = corrected_data.get("functions", [])
-        if corrected_functions:
-            data["functions"] = corrected_functions
-
-        # Deduplicate functions (prefer validated entries)
-        data["functions"] = deduplicate_functions(data.get("functions", []))
+        patch["functions"] = deduplicate_functions(corrected_functions or data.get("functions", []))
 
         # Add function_context differentiation for dual-track system
         # Indirect interactions get "net" context (full chain effects)
         # Direct interactions get "direct" context (pair-specific effects)
-        interaction_type = data.get("interaction_type", "direct")
-        if interaction_type == "indirect":
-            data["function_context"] = "net"  # NET effects through full chain
+        if patch["interaction_type"] == "indirect":
+            patch["function_context"] = "net"  # NET effects through full chain
         elif not data.get("function_context"):
             # Default to "direct" for direct interactions if not already set
-            data["function_context"] = "direct"
+            patch["function_context"] = "direct"
 
-        # Update validation metadata
-        data["_validation_metadata"] = corrected_data.get("_validation_metadata", {})
-        data["_validation_metadata"]["validated_at"] = datetime.utcnow().isoformat()
+        # Update validation metadata (copied: corrected_data may be shared with
+        # the correction log)
+        patch["_validation_metadata"] = dict(corrected_data.get("_validation_metadata", {}))
+        patch["_validation_metadata"]["validated_at"] = datetime.utcnow().isoformat()
 
         if not dry_run:
-            # Write to database
-            interaction.data = data
-            interaction.updated_at = datetime.utcnow()
-
-            # Also update denormalized fields for consistency
-            interaction.direction = data.get("direction")
-            interaction.arrow = data.get("arrow")
-
-            db.session.commit()
+            # Write to database: merge only the changed keys server-side
+            # (data || patch) and update denormalized fields for consistency
+            with DB_WRITE_LOCK, db.session.begin_nested():
+                db.session.execute(
+                    update(Interaction)
+                    .where(Interaction.id == interaction.id)
+                    .values(
+                        data=Interaction.data.op("||")(cast(patch, JSONB)),
+                        direction=patch["direction"],
+                        arrow=patch["arrow"],
+                        updated_at=datetime.utcnow()
+                    ),
+                    execution_options={"synchronize_session": "fetch"}
+                )
 
         return True
 
     except Exception as e:
         print(f"[ERROR] Failed to apply corrections to interaction {interaction.id}: {e}")
-        if not dry_run:
-            db.session.rollback()
         return False
 
 
+def apply_corrections_to_db(
+    interaction: Interaction,
+    corrected_data: Dict[str, Any],
+    dry_run: bool = True
+) -> bool:
+    """
+    Applies corrections to database record and commits.
+
+    Args:
+        interaction: Interaction ORM object
+        corrected_data: Corrected interactor data
+        dry_run: If True, don't actually write to database
+
+    Returns:
+        True if successful
+    """
+    if not stage_corrections(interaction, corrected_data, dry_run=dry_run):
+        return False
+
+    if not dry_run:
+        with DB_WRITE_LOCK:
+            try:
+                db.session.commit()
+            except Exception as e:
+                print(f"[ERROR] Failed to commit corrections to interaction {interaction.id}: {e}")
+                db.session.rollback()
+                return False
+
+    return True
+
+
+def commit_staged_corrections(
+    staged: List[Tuple[str, str]],
+    verbose: bool = False,
+    pruned_index: Optional[Dict[str, List[Path]]] = None,
+    dirty_proteins: Optional[Set[str]] = None
+) -> bool:
+    """
+    Commits every staged correction in one transaction, then invalidates the
+    cache files of the affected protein pairs.
+
+    Args:
+        staged: (main_protein, partner_protein) per staged correction; cleared on return
+        verbose: Enable detailed logging
+        pruned_index: Pruned cache index passed through to invalidate_cache_files
+        dirty_proteins: If given, affected proteins are added here for a later
+            invalidate_protein_caches flush instead of being invalidated now
+
+    Returns:
+        True if the commit succeeded (False means the whole chunk was rolled back)
+    """
+    if not staged:
+        return True
+
+    with DB_WRITE_LOCK:
+        try:
+            db.session.commit()
+        except Exception as e:
+            print(f"[ERROR] Failed to commit {len(staged)} staged correction(s): {e}")
+            db.session.rollback()
+            staged.clear()
+            return False
+
+    # Invalidate cache files to force fresh database read
+    if dirty_proteins is not None:
+        for main, partner in staged:
+            dirty_proteins.update((main, partner))
+    else:
+        for main, partner in dict.fromkeys(staged):
+            invalidate_cache_files(main, partner, verbose=verbose, pruned_index=pruned_index)
+    staged.clear()
+    return True
+
+
+def relax_commit_durability(engine):
+    """
+    Stops this process's connections from waiting for a disk flush on commit.
+
+    Every correction can be re-derived by re-running the script, so losing the
+    last few commits on a crash is an acceptable trade for not waiting on an
+    fsync per chunk. PostgreSQL gets synchronous_commit=off (the database
+    stays consistent; only the latest commits can be lost); the SQLite
+    fallback gets synchronous=NORMAL. Both are per-connection settings: the
+    database itself (e.g. SQLite's persistent journal mode) is left as is.
+
+    Args:
+        engine: SQLAlchemy engine whose connections should be relaxed
+    """
+    dialect = engine.dialect.name
+
+    @event.listens_for(engine, "connect")
+    def _relax_on_connect(dbapi_connection, connection_record):
+        if dialect == "postgresql":
+            # Run outside a transaction so the SET is session-wide
+            existing_autocommit = dbapi_connection.autocommit
+            dbapi_connection.autocommit = True
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SET synchronous_commit TO OFF")
+            cursor.close()
+            dbapi_connection.autocommit = existing_autocommit
+        elif dialect == "sqlite":
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
+    # Drop already-pooled connections so every connection gets the settings
+    engine.dispose()
+
+
+class CorrectionLogWriter:
+    """
+    Appends corrections to an NDJSON file from a background thread.
+
+    Each record is serialized on the calling thread (so later mutation cannot
+    race the writer) and written/flushed by the writer thread, so a crash
+    keeps every correction logged so far.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="correction-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, correction: Dict[str, Any]):
+        """Queue one correction record for appending."""
+        try:
+            self._queue.put(json.dumps(correction, ensure_ascii=False, separators=(",", ":"), default=str))
+        except (TypeError, ValueError) as e:
+            print(f"[WARNING] Failed to serialize correction for {self.path.name}: {e}")
+
+    def close(self):
+        """Flush queued records and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        f = None  # Opened on the first record so clean runs leave no empty file
+        try:
+            while True:
+                line = self._queue.get()
+                if line is None:
+                    break
+                if f is None:
+                    f = open(self.path, 'a', encoding='utf-8')
+                f.write(line + "\n")
+                if self._queue.empty():
+                    f.flush()
+        except OSError as e:
+            print(f"[ERROR] Failed to write correction log {self.path}: {e}")
+        finally:
+            if f is not None:
+                f.close()
+
+
+class CorrectionDbWriter:
+    """
+    Applies Phase 1 corrections to the database from a background thread.
+
+    The thread runs in its own app context (own session), drains up to
+    COMMIT_CHUNK_SIZE queued corrections or whatever arrives within
+    max_wait_sec, stages them and commits once. Committed proteins are
+    collected in a dirty set whose cache files are invalidated every
+    flush_interval_sec and on close, so each protein's caches are deleted
+    once per flush rather than once per correction. Result collection never
+    waits on DB or file I/O.
+    """
+
+    def __init__(
+        self,
+        pruned_index: Optional[Dict[str, List[Path]]] = None,
+        verbose: bool = False,
+        max_wait_sec: float = 0.5,
+        flush_interval_sec: float = 5.0
+    ):
+        self.pruned_index = pruned_index
+        self.verbose = verbose
+        self.max_wait_sec = max_wait_sec
+        self.flush_interval_sec = flush_interval_sec
+        self.error_count = 0
+        self.dirty_proteins = set()
+        self._last_flush = time.monotonic()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="correction-db-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, interaction_id: int, corrected_data: Dict[str, Any], main_protein: str, partner_protein: str):
+        """Queue one correction for writing."""
+        self._queue.put((interaction_id, corrected_data, main_protein, partner_protein))
+
+    def close(self) -> int:
+        """
+        Write everything still queued and stop the writer thread.
+
+        Returns:
+            Number of corrections that failed to apply
+        """
+        self._queue.put(None)
+        self._thread.join()
+        return self.error_count
+
+    def _run(self):
+        with app.app_context():
+            try:
+                done = False
+                while not done:
+                    try:
+                        items = [self._queue.get(timeout=self.flush_interval_sec)]
+                    except queue.Empty:
+                        items = []
+                    deadline = time.monotonic() + self.max_wait_sec
+                    while (not items or items[-1] is not None) and len(items) < COMMIT_CHUNK_SIZE:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        try:
+                            items.append(self._queue.get(timeout=remaining))
+                        except queue.Empty:
+                            break
+
+                    if items and items[-1] is None:
+                        done = True
+                        items.pop()
+                    if items:
+                        self._write(items)
+
+                    if time.monotonic() - self._last_flush >= self.flush_interval_sec:
+                        self._flush_dirty()
+            finally:
+                self._flush_dirty()
+
+    def _flush_dirty(self):
+        """Invalidate the cache files of every protein committed since the last flush."""
+        if self.dirty_proteins:
+            invalidate_protein_caches(self.dirty_proteins, verbose=self.verbose, pruned_index=self.pruned_index)
+            self.dirty_proteins.clear()
+        self._last_flush = time.monotonic()
+
+    def _write(self, items: List[Tuple[int, Dict[str, Any], str, str]]):
+        staged = []
+        for interaction_id, corrected_data, main_protein, partner_protein in items:
+            try:
+                # Re-fetch the ORM object in this thread's session
+                interaction = db.session.get(Interaction, interaction_id)
+            except Exception as e:
+                print(f"[ERROR] Failed to load interaction {interaction_id}: {e}")
+                self.error_count += 1
+                continue
+            if not interaction:
+                continue
+            if stage_corrections(interaction, corrected_data, dry_run=False):
+                staged.append((main_protein, partner_protein))
+            else:
+                self.error_count += 1
+
+        chunk_size = len(staged)
+        if not commit_staged_corrections(staged, verbose=self.verbose, dirty_proteins=self.dirty_proteins):
+            self.error_count += chunk_size
+
+
 def log_corrections(corrections: List[Dict[str, Any]], log_file: Path):
     """
     Logs all corrections to a JSON file for review.
@@ -701,23 +1330,29 @@ def log_corrections(corrections: List[Dict[str, Any]], log_file: Path):
     """
     try:
         with open(log_file, 'w', encoding='utf-8') as f:
-            json.dump(corrections, f, indent=2, ensure_ascii=False)
+            # One dumps + write: json.dump streams many small chunks through
+            # the pure-Python encoder
+            f.write(json.dumps(corrections, indent=2, ensure_ascii=False))
         print(f"[LOG] Corrections saved to: {log_file}")
     except Exception as e:
         print(f"[ERROR] Failed to write log file: {e}")
 
 
-def diagnose_missing_arrows(interaction_data_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+def diagnose_missing_arrows(interaction_data_list: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Diagnoses functions with missing or empty arrow fields.
     Now also tracks indirect interactions and chain data.
 
+    Accepts any iterable so records can be aggregated straight off the
+    database stream; only interactions with issues are retained.
+
     Args:
-        interaction_data_list: List of interaction data dicts
+        interaction_data_list: Iterable of interaction data dicts
 
     Returns:
         Diagnostic report dict with indirect interaction tracking
     """
+    total_interactions = 0
     total_functions = 0
     missing_arrows = 0
     interactions_with_issues = []
@@ -727,9 +1362,11 @@ def diagnose_missing_arrows(interaction_data_list: List[Dict[str, Any]]) -> Dict
     indirect_missing_chain = 0
 
     for interaction_data in interaction_data_list:
+        total_interactions += 1
         data = interaction_data["data"]
-        functions = data.get("functions", [])
+        functions = data.get("functions") or ()
         total_functions += len(functions)
+        interaction_arrow = data.get("arrow", "unknown")
 
         # Check if indirect interaction
         interaction_type = interaction_data.get("interaction_type", "direct")
@@ -741,21 +1378,23 @@ def diagnose_missing_arrows(interaction_data_list: List[Dict[str, Any]]) -> Dict
             if not upstream and not mediator_chain:
                 indirect_missing_chain += 1
 
-        issue_functions = []
-        for func in functions:
-            if not func.get("arrow") or func.get("arrow") == "":
-                missing_arrows += 1
-                issue_functions.append({
-                    "function": func.get("function", "Unknown"),
-                    "current_arrow": func.get("arrow", ""),
-                    "interaction_arrow": data.get("arrow", "unknown")
-                })
+        # One .get per function; most functions have an arrow and are skipped
+        issue_functions = [
+            {
+                "function": func.get("function", "Unknown"),
+                "current_arrow": arrow,
+                "interaction_arrow": interaction_arrow
+            }
+            for func, arrow in ((f, f.get("arrow", "")) for f in functions)
+            if not arrow
+        ]
 
         if issue_functions:
+            missing_arrows += len(issue_functions)
             interactions_with_issues.append({
                 "main_protein": interaction_data["main_protein"],
                 "partner_protein": interaction_data["partner_protein"],
-                "interaction_arrow": data.get("arrow", "unknown"),
+                "interaction_arrow": interaction_arrow,
                 "interaction_type": interaction_type,  # ADD
                 "mediator_chain": mediator_chain,      # ADD
                 "upstream_interactor": upstream,        # ADD
@@ -763,7 +1402,7 @@ def diagnose_missing_arrows(interaction_data_list: List[Dict[str, Any]]) -> Dict
             })
 
     return {
-        "total_interactions": len(interaction_data_list),
+        "total_interactions": total_interactions,
         "total_functions": total_functions,
         "missing_arrows": missing_arrows,
         "indirect_interactions": indirect_count,              # NEW
@@ -772,11 +1411,106 @@ def diagnose_missing_arrows(interaction_data_list: List[Dict[str, Any]]) -> Dict
     }
 
 
+def build_interaction_query(protein_id: Optional[int] = None, limit: Optional[int] = None):
+    """
+    Builds the main() query: each interaction with its main/partner symbols.
+
+    Must be called inside an app context; the query is bound to that
+    context's session.
+
+    Args:
+        protein_id: Only interactions involving this protein (all if None)
+        limit: Maximum number of interactions (all if None)
+
+    Returns:
+        Query yielding (Interaction, main_protein, partner_protein, has_proteins) rows
+    """
+    protein_a_alias = aliased(Protein)
+    protein_b_alias = aliased(Protein)
+    # main = discovered_in_query or protein_a; partner = the other endpoint
+    # (NULLIF keeps Python's `or` semantics for empty strings)
+    main_protein_col = func.coalesce(
+        func.nullif(Interaction.discovered_in_query, ""), protein_a_alias.symbol
+    )
+    query = (
+        db.session.query(
+            Interaction,
+            main_protein_col.label("main_protein"),
+            case(
+                (main_protein_col == protein_a_alias.symbol, protein_b_alias.symbol),
+                else_=protein_a_alias.symbol
+            ).label("partner_protein"),
+            (protein_a_alias.id.isnot(None) & protein_b_alias.id.isnot(None)).label("has_proteins")
+        )
+        .outerjoin(protein_a_alias, Interaction.protein_a_id == protein_a_alias.id)
+        .outerjoin(protein_b_alias, Interaction.protein_b_id == protein_b_alias.id)
+    )
+
+    if protein_id is not None:
+        query = query.filter(
+            (Interaction.protein_a_id == protein_id) |
+            (Interaction.protein_b_id == protein_id)
+        )
+
+    if limit:
+        query = query.limit(limit)
+
+    return query
+
+
+def iter_interaction_records(query):
+    """
+    Streams plain interaction dicts (no ORM objects) from build_interaction_query.
+
+    Rows come from a server-side cursor in chunks of 500, so nothing is
+    materialized up front; ORM objects are re-fetched by id on write.
+    """
+    for interaction, main_protein, partner_protein, has_proteins in query.yield_per(500):
+        if not has_proteins:
+            print(f"[WARNING] Skipping interaction {interaction.id} (missing protein records)")
+            continue
+
+        yield {
+            "id": interaction.id,
+            "data": interaction.data,
+            "main_protein": main_protein,
+            "partner_protein": partner_protein,
+            # Chain fields from table columns (for indirect interactions)
+            "upstream_interactor": interaction.upstream_interactor,
+            "mediator_chain": interaction.mediator_chain or [],
+            "depth": interaction.depth or 1,
+            "interaction_type": interaction.interaction_type or "direct"
+        }
+
+
+def produce_interaction_records(
+    out_queue: "queue.Queue",
+    protein_id: Optional[int] = None,
+    limit: Optional[int] = None
+):
+    """
+    Producer thread body: extracts interaction dicts into out_queue.
+
+    Runs in its own app context (and so its own session and connection), so
+    the main thread can validate and commit while rows are still being read.
+    Always finishes with a None sentinel.
+    """
+    try:
+        with app.app_context():
+            for record in iter_interaction_records(build_interaction_query(protein_id, limit)):
+                out_queue.put(record)
+    except Exception as e:
+        print(f"[ERROR] Failed to extract interactions: {e}")
+    finally:
+        out_queue.put(None)
+
+
 def validate_and_update_interactions(
     protein_symbol: str,
     api_key: str,
     verbose: bool = False,
-    dry_run: bool = False
+    dry_run: bool = False,
+    aggressive: bool = False
 ) -> Dict[str, int]:
     """
     Validate and update interactions for a specific protein (programmatic interface).
@@ -786,6 +1520,7 @@ def validate_and_update_interactions(
         api_key: Google AI API key
         verbose: Enable verbose logging
         dry_run: Don't write to database
+        aggressive: Run Tier 2 pipeline queries even without pair evidence in the chain
 
     Returns:
         Stats dict with correction counts
@@ -809,12 +1544,17 @@ def validate_and_update_interactions(
             return {"corrections": 0, "direct_links": 0}
 
         # Extract data from database
+        # Load every endpoint protein with one IN (...) query
+        needed_ids = {i.protein_a_id for i in interactions} | {i.protein_b_id for i in interactions}
+        proteins_by_id = {p.id: p for p in Protein.query.filter(Protein.id.in_(needed_ids)).all()}
+
         interaction_data_list = []
+        indirect_interaction_data = []  # Partitioned up front for Phase 2
         interaction_map = {}
 
         for interaction in interactions:
-            protein_a = db.session.get(Protein, interaction.protein_a_id)
-            protein_b = db.session.get(Protein, interaction.protein_b_id)
+            protein_a = proteins_by_id.get(interaction.protein_a_id)
+            protein_b = proteins_by_id.get(interaction.protein_b_id)
 
             if not protein_a or not protein_b:
                 continue
@@ -834,6 +1574,8 @@ def validate_and_update_interactions(
             }
 
             interaction_data_list.append(interaction_data)
+            if interaction_data["interaction_type"] == "indirect":
+                indirect_interaction_data.append(interaction_data)
             interaction_map[interaction.id] = interaction
 
         # Phase 1: Validate existing interactions
@@ -847,25 +1589,33 @@ def validate_and_update_interactions(
 
             if correction and not dry_run:
                 interaction_orm = interaction_map[correction["interaction_id"]]
-                success = apply_corrections_to_db(
+                success = stage_corrections(
                     interaction_orm,
                     correction["corrected_data"],
                     dry_run=False
                 )
                 if success:
                     corrections.append(correction)
+                    if len(corrections) % COMMIT_CHUNK_SIZE == 0:
+                        with DB_WRITE_LOCK:
+                            db.session.commit()
+
+        with DB_WRITE_LOCK:
+            db.session.commit()
 
         # Phase 2: Extract and validate direct mediator links
+        proteins_by_symbol, interactions_by_pair = preload_direct_pair_index(indirect_interaction_data)
+        existing_interactions = preload_pair_interactions(interactions_by_pair)  # Held for the identity map
         direct_links_created = 0
-        for interaction_data in interaction_data_list:
-            if interaction_data.get("interaction_type") != "indirect":
-                continue
-
+        for interaction_data in indirect_interaction_data:
             direct_link_data = process_indirect_interaction(
                 interaction_data,
                 interaction_map,
                 verbose=verbose,
-                api_key=api_key
+                api_key=api_key,
+                proteins_by_symbol=proteins_by_symbol,
+                interactions_by_pair=interactions_by_pair,
+                aggressive=aggressive
             )
 
             if direct_link_data and not dry_run:
@@ -880,22 +1630,11 @@ def validate_and_update_interactions(
                 mediator = direct_link_data["main_protein"]
                 target = direct_link_data["partner_protein"]
 
-                mediator_protein = Protein.query.filter_by(symbol=mediator).first()
-                target_protein = Protein.query.filter_by(symbol=target).first()
+                mediator_protein, target_protein, existing = lookup_pair(
+                    mediator, target, proteins_by_symbol, interactions_by_pair
+                )
 
                 if mediator_protein and target_protein:
-                    # Check for existing interaction
-                    if mediator_protein.id < target_protein.id:
-                        existing = db.session.query(Interaction).filter(
-                            Interaction.protein_a_id == mediator_protein.id,
-                            Interaction.protein_b_id == target_protein.id
-                        ).first()
-                    else:
-                        existing = db.session.query(Interaction).filter(
-                            Interaction.protein_a_id == target_protein.id,
-                            Interaction.protein_b_id == mediator_protein.id
-                        ).first()
-
                     if existing:
                         # Apply corrections if validator made any
                         if correction:
@@ -908,7 +1647,8 @@ def validate_and_update_interactions(
                         # Would need full creation logic here
                         direct_links_created += 1
 
-        db.session.commit()
+        with DB_WRITE_LOCK:
+            db.session.commit()
 
         return {
             "corrections": len(corrections),
@@ -924,6 +1664,11 @@ def main():
     parser.add_argument("--protein", type=str, help="Only validate interactions for specific protein")
     parser.add_argument("--limit", type=int, help="Limit number of interactions to process (for testing)")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help=f"Interactions per Gemini validation call (default: {DEFAULT_BATCH_SIZE}, from ARROW_VALIDATOR_BATCH_SIZE)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help=f"Concurrent Gemini validation calls (default: {MAX_WORKERS}, from GEMINI_RPM x AVG_CALL_LATENCY_SEC)")
+    parser.add_argument("--aggressive", action="store_true", help="Query the pipeline (Tier 2) for every mediator link, even without pair evidence in the chain")
+    parser.add_argument("--durable-commits", action="store_true", help="Wait for a disk flush on every commit (default: relaxed, see relax_commit_durability)")
+    parser.add_argument("--no-cache", action="store_true", help=f"Ignore and don't write cached Gemini corrections in {VALIDATION_CACHE_DIR}")
     args = parser.parse_args()
 
     # Load environment
@@ -942,80 +1687,41 @@ def main():
     print(f"RETROACTIVE ARROW VALIDATION ({mode})")
     print(f"{'='*60}")
 
-    # Query interactions
     with app.app_context():
-        query = Interaction.query
+        if not args.dry_run and not args.durable_commits:
+            relax_commit_durability(db.engine)
 
         # Filter by protein if specified
+        protein_id = None
         if args.protein:
             protein = Protein.query.filter_by(symbol=args.protein).first()
             if not protein:
                 print(f"[ERROR] Protein '{args.protein}' not found in database")
                 sys.exit(1)
-            query = query.filter(
-                (Interaction.protein_a_id == protein.id) |
-                (Interaction.protein_b_id == protein.id)
-            )
+            protein_id = protein.id
             print(f"[INFO] Filtering to protein: {args.protein}")
 
         # Apply limit if specified
         if args.limit:
-            query = query.limit(args.limit)
             print(f"[INFO] Limiting to {args.limit} interactions")
 
-        interactions = query.all()
-
-        if not interactions:
-            print("[INFO] No interactions found to validate")
-            sys.exit(0)
-
-        print(f"[INFO] Found {len(interactions)} interactions to validate")
         print(f"[INFO] Extracting data from database...\n")
-
-        # Extract all data from database BEFORE parallel processing
-        # This avoids application context issues in worker threads
-        interaction_data_list = []
-        interaction_map = {}  # Map interaction_id -> ORM object for later updates
-
-        for interaction in interactions:
-            # Get protein symbols
-            protein_a = db.session.get(Protein, interaction.protein_a_id)
-            protein_b = db.session.get(Protein, interaction.protein_b_id)
-
-            if not protein_a or not protein_b:
-                print(f"[WARNING] Skipping interaction {interaction.id} (missing protein records)")
-                continue
-
-            # Determine main protein (use discovered_in_query or default to protein_a)
-            main_protein = interaction.discovered_in_query or protein_a.symbol
-            partner_protein = protein_b.symbol if main_protein == protein_a.symbol else protein_a.symbol
-
-            # Create plain dict for worker (no ORM objects)
-            interaction_data = {
-                "id": interaction.id,
-                "data": interaction.data,
-                "main_protein": main_protein,
-                "partner_protein": partner_protein,
-                # Chain fields from table columns (for indirect interactions)
-                "upstream_interactor": interaction.upstream_interactor,
-                "mediator_chain": interaction.mediator_chain or [],
-                "depth": interaction.depth or 1,
-                "interaction_type": interaction.interaction_type or "direct"
-            }
-
-            interaction_data_list.append(interaction_data)
-            interaction_map[interaction.id] = interaction
-
-        print(f"[INFO] Processing {len(interaction_data_list)} interactions with {MAX_WORKERS} workers\n")
+        workers = max(1, args.workers)
 
         # DIAGNOSTIC MODE: Report missing arrows and exit
         if args.diagnose:
+            # Aggregate while streaming instead of materializing every record
+            report = diagnose_missing_arrows(iter_interaction_records(
+                build_interaction_query(protein_id, args.limit)
+            ))
+            if not report['total_interactions']:
+                print("[INFO] No interactions found to validate")
+                sys.exit(0)
+
             print(f"{'='*60}")
             print(f"DIAGNOSTIC MODE: Analyzing function arrows...")
             print(f"{'='*60}\n")
 
-            report = diagnose_missing_arrows(interaction_data_list)
-
             print(f"Total Interactions: {report['total_interactions']}")
             print(f"Total Functions: {report['total_functions']}")
             print(f"Missing Function Arrows: {report['missing_arrows']}")
@@ -1037,7 +1743,7 @@ def main():
                     if interaction_type == "indirect":
                         mediator_chain = issue.get('mediator_chain', [])
                         if mediator_chain:
-                            chain_str = " → ".join([main] + mediator_chain + [partner])
+                            chain_str = " → ".join(itertools.chain((main,), mediator_chain, (partner,)))
                             print(f"{chain_str} (indirect)")
                         else:
                             upstream = issue.get('upstream_interactor', '?')
@@ -1056,7 +1762,7 @@ def main():
             # Save diagnostic report
             diag_file = LOG_DIR / f"diagnostic_{timestamp}.json"
             with open(diag_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+                f.write(json.dumps(report, indent=2, ensure_ascii=False))
 
             print(f"{'='*60}")
             print(f"Diagnostic report saved to: {diag_file}")
@@ -1064,87 +1770,170 @@ def main():
 
             return  # Exit without validation
 
-        # Validate interactions in parallel
+        # Validate interactions in parallel while they are still being read:
+        # a producer thread streams rows into a bounded queue, slices are sent
+        # to Gemini as soon as they fill, and results are written back here
         all_corrections = []
         validated_count = 0
         error_count = 0
 
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Submit all tasks with plain dicts (not ORM objects)
-            future_to_id = {
-                executor.submit(
-                    validate_interaction_record,
-                    interaction_data,
-                    api_key,
-                    args.verbose
-                ): interaction_data["id"]
-                for interaction_data in interaction_data_list
-            }
+        batch_size = max(1, args.batch_size)
+        # Only indirect interactions are kept past their validation slice
+        # (Phase 2 needs nothing else), so memory stays O(in-flight slices)
+        indirect_interaction_data: List[Dict[str, Any]] = []
+        total = 0  # Interactions extracted so far
+        max_in_flight = workers * 2  # Slices queued or running at once
+
+        extract_queue = queue.Queue(maxsize=1024)
+        producer = threading.Thread(
+            target=produce_interaction_records,
+            args=(extract_queue, protein_id, args.limit),
+            name="interaction-extractor",
+            daemon=True
+        )
+        producer.start()
+        print(f"[INFO] Processing interactions with {workers} workers\n")
+
+        async def validate_all_batches(client):
+            """Yield (batch, corrections or exception) as each slice finishes."""
+            nonlocal total
+            semaphore = asyncio.Semaphore(workers)
+            loop = asyncio.get_running_loop()
+
+            async def run(batch):
+                async with semaphore:
+                    try:
+                        return batch, await validate_interaction_records_batch_async(
+                            batch, client, args.verbose, use_cache=not args.no_cache
+                        )
+                    except Exception as exc:
+                        return batch, exc
+
+            # One task per slice of plain dicts (not ORM objects); each slice
+            # is validated with a single Gemini call
+            pending = set()
+            batch = []
+            while True:
+                record = await loop.run_in_executor(None, extract_queue.get)
+                if record is not None:
+                    if record.get("interaction_type") == "indirect":
+                        indirect_interaction_data.append(record)
+                    total += 1
+                    batch.append(record)
+                if batch and (record is None or len(batch) >= batch_size):
+                    pending.add(asyncio.ensure_future(run(batch)))
+                    batch = []
+                if record is None:
+                    break
+
+                # Hand back slices that finished while extraction continues;
+                # once max_in_flight slices are outstanding, wait for one
+                # (this also back-pressures the producer via its bounded queue)
+                if len(pending) >= max_in_flight:
+                    await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                done = [t for t in pending if t.done()]
+                pending.difference_update(done)
+                while done:
+                    yield done.pop().result()
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                while done:
+                    yield done.pop().result()
+
+        async def run_validation():
+            """Validate on one Gemini client, created on this loop and closed with it."""
+            client = google_genai.Client(api_key=api_key)
+            try:
+                await consume_batches(client)
+            finally:
+                await client.aio.aclose()
+
+        async def consume_batches(client):
+            """Consume finished slices on the main thread, which owns the DB session."""
+            nonlocal validated_count, error_count
+
+            async for batch, batch_corrections in validate_all_batches(client):
+                if isinstance(batch_corrections, Exception):
+                    error_count += len(batch)
+                    validated_count += len(batch)
+                    print(f"  [{validated_count}/{total}] ✗ Error: {batch_corrections}")
+                    continue
+
+                for interaction_data, correction in zip(batch, batch_corrections):
+                    interaction_id = interaction_data["id"]
+                    validated_count += 1
+                    progress = f"  [{validated_count}/{total}]"
+
+                    try:
+                        if correction:
+                            # Corrections were made
+                            main = correction["main_protein"]
+                            partner = correction["partner_protein"]
+                            count = correction["corrections_count"]
+
+                            # Add chain context to correction record
+                            original_data = correction["original_data"]
+                            interaction_type = original_data.get("interaction_type", "direct")
+                            mediator_chain = original_data.get("mediator_chain", [])
+                            upstream = original_data.get("upstream_interactor")
+
+                            correction["chain_context"] = {
+                                "interaction_type": interaction_type,
+                                "mediator_chain": mediator_chain,
+                                "upstream_interactor": upstream,
+                                "depth": original_data.get("depth", 1)
+                            }
+
+                            all_corrections.append(correction)
+
+                            # Display with chain context for indirect interactions
+                            if interaction_type == "indirect":
+                                if mediator_chain:
+                                    chain_str = " → ".join(itertools.chain((main,), mediator_chain, (partner,)))
+                                    print(f"{progress} ✓ {chain_str}: {count} correction(s)")
+                                elif upstream:
+                                    print(f"{progress} ✓ {main} → {partner} (via {upstream}): {count} correction(s)")
+                                else:
+                                    print(f"{progress} ✓ {main} → {partner} (indirect): {count} correction(s)")
+                            else:
+                                print(f"{progress} ✓ {main} ↔ {partner}: {count} correction(s)")
 
-            # Collect results as they complete
-            for future in as_completed(future_to_id):
-                interaction_id = future_to_id[future]
-                validated_count += 1
+                            # Append to the NDJSON log as we go (crash-resilient)
+                            correction_log.write(correction)
 
-                try:
-                    correction = future.result()
-
-                    if correction:
-                        # Corrections were made
-                        main = correction["main_protein"]
-                        partner = correction["partner_protein"]
-                        count = correction["corrections_count"]
-
-                        # Add chain context to correction record
-                        original_data = correction["original_data"]
-                        interaction_type = original_data.get("interaction_type", "direct")
-                        mediator_chain = original_data.get("mediator_chain", [])
-                        upstream = original_data.get("upstream_interactor")
-
-                        correction["chain_context"] = {
-                            "interaction_type": interaction_type,
-                            "mediator_chain": mediator_chain,
-                            "upstream_interactor": upstream,
-                            "depth": original_data.get("depth", 1)
-                        }
-
-                        all_corrections.append(correction)
-
-                        # Display with chain context for indirect interactions
-                        if interaction_type == "indirect":
-                            if mediator_chain:
-                                chain_str = " → ".join([main] + mediator_chain + [partner])
-                                print(f"  [{validated_count}/{len(interaction_data_list)}] ✓ {chain_str}: {count} correction(s)")
-                            elif upstream:
-                                print(f"  [{validated_count}/{len(interaction_data_list)}] ✓ {main} → {partner} (via {upstream}): {count} correction(s)")
-                            else:
-                                print(f"  [{validated_count}/{len(interaction_data_list)}] ✓ {main} → {partner} (indirect): {count} correction(s)")
+                            # Hand off to the writer thread if not dry-run
+                            if not args.dry_run:
+                                db_writer.put(interaction_id, correction["corrected_data"], main, partner)
                         else:
-                            print(f"  [{validated_count}/{len(interaction_data_list)}] ✓ {main} ↔ {partner}: {count} correction(s)")
-
-                        # Apply to database if not dry-run
-                        if not args.dry_run:
-                            # Get ORM object from map
-                            interaction = interaction_map.get(interaction_id)
-                            if interaction:
-                                success = apply_corrections_to_db(
-                                    interaction,
-                                    correction["corrected_data"],
-                                    dry_run=False
-                                )
-                                if success:
-                                    # Invalidate cache files to force fresh database read
-                                    invalidate_cache_files(main, partner, verbose=args.verbose)
-                                else:
-                                    error_count += 1
-                    else:
-                        # No corrections needed
-                        if args.verbose:
-                            print(f"  [{validated_count}/{len(interaction_data_list)}] → No corrections needed")
+                            # No corrections needed
+                            if args.verbose:
+                                print(f"{progress} → No corrections needed")
+
+                    except Exception as exc:
+                        error_count += 1
+                        print(f"{progress} ✗ Error: {exc}")
+
+        correction_log = CorrectionLogWriter(log_file.with_suffix(".ndjson"))
+        db_writer = None
+        if not args.dry_run:
+            db_writer = CorrectionDbWriter(
+                pruned_index=build_pruned_cache_index(),  # Listed once, not per invalidation
+                verbose=args.verbose
+            )
+        try:
+            asyncio.run(run_validation())
+        finally:
+            correction_log.close()
+            if db_writer:
+                error_count += db_writer.close()
+        producer.join()
+
+        if not total:
+            print("[INFO] No interactions found to validate")
+            sys.exit(0)
 
-                except Exception as exc:
-                    error_count += 1
-                    print(f"  [{validated_count}/{len(interaction_data_list)}] ✗ Error: {exc}")
+        print(f"\n[INFO] Validated {total} interactions")
 
         # ========================================
         # PHASE 2: Extract and validate direct mediator links from indirect interactions
@@ -1153,97 +1942,172 @@ def main():
         print(f"PHASE 2: EXTRACTING DIRECT MEDIATOR LINKS")
         print(f"{'='*60}\n")
 
-        direct_links_extracted = []
         direct_links_validated = 0
         direct_links_created = 0
         tier1_count = 0  # Database evidence
         tier2_count = 0  # Pipeline queries
         tier3_count = 0  # Chain extraction
 
-        for interaction_data in interaction_data_list:
-            # Only process indirect interactions
-            if interaction_data.get("interaction_type") != "indirect":
-                continue
+        # Preload mediator/target proteins and existing pair interactions once
+        proteins_by_symbol, interactions_by_pair = preload_direct_pair_index(indirect_interaction_data)
+        # Held for the rest of Phase 2 so Tier 1 checks and corrections hit the identity map
+        existing_interactions = preload_pair_interactions(interactions_by_pair)
+
+        # Tier 1 links reuse an existing record, so several indirect chains through
+        # the same mediator→target pair collapse to one link per record
+        tier1_links: Dict[int, Dict[str, Any]] = {}
+        tier23_links: List[Dict[str, Any]] = []
 
+        # Phase 1 only kept indirect interactions, so no per-record type check here
+        for interaction_data in indirect_interaction_data:
             # Extract direct mediator link (with 3-tier strategy)
             direct_link_data = process_indirect_interaction(
                 interaction_data,
-                interaction_map,
+                {},  # No ORM map in main: rows are streamed, not kept
                 verbose=args.verbose,
-                api_key=api_key  # Pass API key for Tier 2 pipeline queries
+                api_key=api_key,  # Pass API key for Tier 2 pipeline queries
+                proteins_by_symbol=proteins_by_symbol,
+                interactions_by_pair=interactions_by_pair,
+                aggressive=args.aggressive
             )
 
             if direct_link_data:
-                direct_links_extracted.append(direct_link_data)
-
                 # Track tier usage
                 tier = direct_link_data.get("_evidence_tier", 3)
                 if tier == 1:
                     tier1_count += 1
-                elif tier == 2:
-                    tier2_count += 1
+                    tier1_links.setdefault(direct_link_data["_existing_db_id"], direct_link_data)
                 else:
-                    tier3_count += 1
+                    tier23_links.append(direct_link_data)
+                    if tier == 2:
+                        tier2_count += 1
+                    else:
+                        tier3_count += 1
+
+        direct_links_extracted = list(tier1_links.values()) + tier23_links
 
-        print(f"[INFO] Found {len(direct_links_extracted)} indirect interactions with extractable direct links")
+        print(f"[INFO] Found {tier1_count + tier2_count + tier3_count} indirect interactions with extractable direct links")
         print(f"[INFO] Evidence sources: Tier 1 (Database)={tier1_count}, Tier 2 (Pipeline)={tier2_count}, Tier 3 (Extraction)={tier3_count}\n")
+        if tier1_links:
+            # Tier 1 links are still validated; the existing record is the context
+            print(f"[INFO] {len(tier1_links)} Tier 1 link(s) reuse existing database records as context"
+                  f" ({tier1_count - len(tier1_links)} duplicate(s) skipped)\n")
+
+        # Phase 2 writes are staged in savepoints and committed every
+        # COMMIT_CHUNK_SIZE links rather than once per link
+        phase2_staged = 0
+        phase2_created = 0  # New links in the uncommitted chunk
+        # New links are queued as plain column dicts (keyed by canonical pair)
+        # and inserted with one executemany per chunk, bypassing the ORM unit of work
+        pending_links: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+        def insert_pending_links():
+            nonlocal phase2_staged, phase2_created, direct_links_created, error_count
+            if not pending_links:
+                return
+            rows = list(pending_links.values())
+            pending_links.clear()
+            try:
+                with DB_WRITE_LOCK, db.session.begin_nested():
+                    inserted = db.session.execute(
+                        insert(Interaction).returning(
+                            Interaction.id, Interaction.protein_a_id, Interaction.protein_b_id
+                        ),
+                        rows
+                    ).all()
+            except Exception as e:
+                print(f"[ERROR] Failed to insert {len(rows)} direct link(s): {e}")
+                error_count += len(rows)
+                phase2_staged -= len(rows)
+                phase2_created -= len(rows)
+                direct_links_created -= len(rows)
+                return
+            # Keep the preloaded index current for later links to these pairs
+            for interaction_id, protein_a_id, protein_b_id in inserted:
+                interactions_by_pair[(protein_a_id, protein_b_id)] = (interaction_id, "direct")
+            print(f"    → Inserted {len(inserted)} new direct link(s)")
+
+        def commit_phase2_chunk():
+            nonlocal phase2_staged, phase2_created, direct_links_created, error_count
+            insert_pending_links()
+            if not phase2_staged:
+                return
+            with DB_WRITE_LOCK:
+                try:
+                    db.session.commit()
+                except Exception as e:
+                    print(f"[ERROR] Failed to commit {phase2_staged} direct link write(s): {e}")
+                    db.session.rollback()
+                    error_count += phase2_staged
+                    direct_links_created -= phase2_created
+            phase2_staged = 0
+            phase2_created = 0
 
         if direct_links_extracted:
-            # Validate direct links sequentially (not parallel)
+            # Stage A: validate every direct link concurrently (the calls are
+            # API-bound); plain dicts only, so worker threads need no session
+            print(f"[INFO] Validating {len(direct_links_extracted)} direct links with {workers} workers\n")
+            validate_fn = functools.partial(
+                validate_interaction_record,
+                api_key=api_key,
+                verbose=args.verbose,
+                use_cache=not args.no_cache
+            )
+            # Sliding window: at most workers*2 links are queued on the pool at once
+            link_corrections: List[Optional[Dict[str, Any]]] = [None] * len(direct_links_extracted)
+            window = workers * 2
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                inflight = {}
+                for idx, link in enumerate(direct_links_extracted):
+                    if len(inflight) >= window:
+                        done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            link_corrections[inflight.pop(future)] = future.result()
+                    inflight[executor.submit(validate_fn, link)] = idx
+                for future in as_completed(inflight):
+                    link_corrections[inflight[future]] = future.result()
+
+            # Stage B: apply results on this thread, which owns the DB session.
+            # New rows share one timestamp, matching the chunked commits below
+            batch_now = datetime.utcnow()
+            # Tier indicators for logging
+            tier_labels = {1: "TIER 1:DB", 2: "TIER 2:PIPELINE", 3: "TIER 3:EXTRACT"}
             for idx, direct_link_data in enumerate(direct_links_extracted):
                 mediator = direct_link_data["main_protein"]
                 target = direct_link_data["partner_protein"]
-                tier = direct_link_data.get("_evidence_tier", 3)
-
-                # Tier indicators for logging
-                tier_labels = {1: "TIER 1:DB", 2: "TIER 2:PIPELINE", 3: "TIER 3:EXTRACT"}
-                tier_label = tier_labels.get(tier, "UNKNOWN")
+                tier_label = tier_labels.get(direct_link_data.get("_evidence_tier", 3), "UNKNOWN")
 
                 try:
-                    print(f"  [{idx+1}/{len(direct_links_extracted)}] [{tier_label}] Validating: {mediator} → {target}")
-
-                    # ALL TIERS: Validate the direct link (even if from existing DB)
-                    # For Tier 1, the existing DB record provides context but we still validate
-                    if tier == 1:
-                        existing_id = direct_link_data.get("_existing_db_id")
-                        print(f"    → Using existing database record (ID: {existing_id}) as context, validating...")
-
-                    correction = validate_interaction_record(
-                        direct_link_data,
-                        api_key,
-                        verbose=args.verbose
-                    )
+                    print(f"  [{idx+1}/{len(direct_links_extracted)}] [{tier_label}] Validated: {mediator} → {target}")
+
+                    correction = link_corrections[idx]
 
                     direct_links_validated += 1
 
-                    # Check if this link already exists in database
-                    # Query for existing interaction between mediator and target
-                    mediator_protein = Protein.query.filter_by(symbol=mediator).first()
-                    target_protein = Protein.query.filter_by(symbol=target).first()
+                    # Check if this link already exists in database (preloaded index)
+                    mediator_protein, target_protein, existing = lookup_pair(
+                        mediator, target, proteins_by_symbol, interactions_by_pair
+                    )
 
                     if mediator_protein and target_protein:
-                        # Check for existing interaction (canonical ordering)
-                        if mediator_protein.id < target_protein.id:
-                            existing = db.session.query(Interaction).filter(
-                                Interaction.protein_a_id == mediator_protein.id,
-                                Interaction.protein_b_id == target_protein.id
-                            ).first()
-                        else:
-                            existing = db.session.query(Interaction).filter(
-                                Interaction.protein_a_id == target_protein.id,
-                                Interaction.protein_b_id == mediator_protein.id
-                            ).first()
+                        if not existing and canonical_ids(mediator_protein, target_protein)[:2] in pending_links:
+                            # This pair is still queued; insert it so the corrections land on that row
+                            insert_pending_links()
+                            _, _, existing = lookup_pair(
+                                mediator, target, proteins_by_symbol, interactions_by_pair
+                            )
 
                         if existing:
                             print(f"    → Direct link already exists in database (ID: {existing.id})")
                             # Apply corrections if validator made any
                             if correction and not args.dry_run:
-                                success = apply_corrections_to_db(
+                                success = stage_corrections(
                                     existing,
                                     correction["corrected_data"],
                                     dry_run=False
                                 )
                                 if success:
+                                    phase2_staged += 1
                                     print(f"    → Applied corrections to existing direct link")
                         else:
                             # Create new direct link in database
@@ -1257,53 +2121,44 @@ def main():
                                 link_data["interaction_type"] = "direct"
 
                                 # Create new interaction record
-                                # Determine canonical ordering
-                                if mediator_protein.id < target_protein.id:
-                                    new_interaction = Interaction(
-                                        protein_a_id=mediator_protein.id,
-                                        protein_b_id=target_protein.id,
-                                        confidence=link_data.get("confidence", 0.5),
-                                        direction=link_data.get("direction", "bidirectional"),
-                                        arrow=link_data.get("arrow", "binds"),
-                                        data=link_data,
-                                        discovered_in_query=direct_link_data["data"].get("_original_chain", "").split("→")[0],
-                                        discovery_method="indirect_chain_extraction",
-                                        interaction_type="direct",
-                                        created_at=datetime.utcnow(),
-                                        updated_at=datetime.utcnow()
-                                    )
-                                else:
-                                    # Flip direction for canonical ordering
-                                    flipped_direction = link_data.get("direction", "bidirectional")
-                                    if flipped_direction == "main_to_primary":
-                                        flipped_direction = "primary_to_main"
-                                    elif flipped_direction == "primary_to_main":
-                                        flipped_direction = "main_to_primary"
-
-                                    new_interaction = Interaction(
-                                        protein_a_id=target_protein.id,
-                                        protein_b_id=mediator_protein.id,
-                                        confidence=link_data.get("confidence", 0.5),
-                                        direction=flipped_direction,
-                                        arrow=link_data.get("arrow", "binds"),
-                                        data=link_data,
-                                        discovered_in_query=direct_link_data["data"].get("_original_chain", "").split("→")[0],
-                                        discovery_method="indirect_chain_extraction",
-                                        interaction_type="direct",
-                                        created_at=datetime.utcnow(),
-                                        updated_at=datetime.utcnow()
-                                    )
-
-                                db.session.add(new_interaction)
-                                db.session.commit()
+                                # Only the chain's first hop (the query protein) is needed
+                                discovered_in_query = direct_link_data["data"].get(
+                                    "_original_chain", ""
+                                ).split("→", 1)[0]
+                                protein_a_id, protein_b_id, flipped = canonical_ids(
+                                    mediator_protein, target_protein
+                                )
+                                direction = link_data.get("direction", "bidirectional")
+                                if flipped:
+                                    direction = FLIPPED_DIRECTION.get(direction, direction)
+
+                                pending_links[(protein_a_id, protein_b_id)] = {
+                                    "protein_a_id": protein_a_id,
+                                    "protein_b_id": protein_b_id,
+                                    "confidence": link_data.get("confidence", 0.5),
+                                    "direction": direction,
+                                    "arrow": link_data.get("arrow", "binds"),
+                                    "data": link_data,
+                                    "discovered_in_query": discovered_in_query,
+                                    "discovery_method": "indirect_chain_extraction",
+                                    "interaction_type": "direct",
+                                    "created_at": batch_now,
+                                    "updated_at": batch_now
+                                }
+                                phase2_staged += 1
+                                phase2_created += 1
                                 direct_links_created += 1
-                                print(f"    → Created direct link successfully (ID: {new_interaction.id})")
+                                print(f"    → Queued new direct link for insert")
+
+                    if phase2_staged >= COMMIT_CHUNK_SIZE:
+                        commit_phase2_chunk()
 
                 except Exception as exc:
                     error_count += 1
                     print(f"  [{idx+1}/{len(direct_links_extracted)}] ✗ Error validating {mediator}→{target}: {exc}")
-                    if not args.dry_run:
-                        db.session.rollback()
+
+            # Commit the final partial chunk
+            commit_phase2_chunk()
 
         print(f"\n[PHASE 2 COMPLETE]")
         print(f"  Direct links extracted: {len(direct_links_extracted)}")
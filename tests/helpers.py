@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Shared setup for the manual server test scripts (test_server.py, test_visualize_fix.py)
+"""
+
+import functools
+import logging
+import os
+import socket
+import sys
+from urllib.parse import urlsplit
+
+
+def get_logger(name):
+    """
+    Returns a logger that prints bare messages to stdout.
+
+    Progress goes through `logging` with lazy %-formatting; failures are logged
+    at ERROR/WARNING, so TEST_LOG_LEVEL=WARNING prints only what went wrong.
+    """
+    log = logging.getLogger(name)
+    if not log.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.setLevel(os.getenv("TEST_LOG_LEVEL", "INFO").upper())
+        log.propagate = False
+    return log
+
+
+@functools.lru_cache(maxsize=8)
+def server_is_up(base_url, timeout=0.05):
+    """
+    Probes the server with a single TCP connect, shared by every test in the run.
+
+    A stopped server then fails fast instead of each request waiting out
+    its own connection attempt.
+    """
+    url = urlsplit(base_url)
+    try:
+        with socket.create_connection((url.hostname, url.port or 80), timeout):
+            return True
+    except OSError:
+        return False
@@ -1,16 +1,38 @@
 #!/usr/bin/env python3
 """Quick test script to verify server is responding correctly"""
+import atexit
+import logging
+import os
 import requests
 import json
+from requests.adapters import HTTPAdapter
+
+from helpers import get_logger, server_is_up
 
 BASE_URL = "http://localhost:5000"
+_H2 = "=" * 60  # Section rule, built once
+# Fail fast when nothing is listening, but give the server time to answer
+_CONNECT_TIMEOUT = 0.25
+_READ_TIMEOUT = 10
+
+log = get_logger(__name__)
+
+
+# One keep-alive session for every call instead of a new connection each time
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+atexit.register(SESSION.close)
 
 def test_query_endpoint():
     """Test the /api/query endpoint with ATXN3"""
-    print("Testing /api/query endpoint with ATXN3...")
+    log.info("Testing /api/query endpoint with ATXN3...")
+
+    if not server_is_up(BASE_URL):
+        log.error("[ERROR] Server is not running on localhost:5000")
+        return
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/query",
             json={
                 "protein": "ATXN3",
@@ -18,43 +40,44 @@ def test_query_endpoint():
                 "function_rounds": 3,
                 "skip_validation": False
             },
-            timeout=5
+            timeout=(_CONNECT_TIMEOUT, _READ_TIMEOUT)
         )
 
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        log.info("Status Code: %s", response.status_code)
 
-        data = response.json()
+        data = response.json()  # Parsed once, reused for display and checks
+        if log.isEnabledFor(logging.INFO):  # Skip the pretty-print when quiet
+            log.info("Response: %s", json.dumps(data, indent=2))
         if data.get("status") == "processing":
-            print("[OK] Server correctly started a new job for ATXN3")
+            log.info("[OK] Server correctly started a new job for ATXN3")
         elif data.get("status") == "complete":
-            print("[ERROR] Server says ATXN3 is cached (but it shouldn't be)")
+            log.error("[ERROR] Server says ATXN3 is cached (but it shouldn't be)")
         else:
-            print(f"[WARN] Unexpected status: {data.get('status')}")
+            log.warning("[WARN] Unexpected status: %s", data.get('status'))
 
     except requests.exceptions.ConnectionError:
-        print("[ERROR] Server is not running on localhost:5000")
+        log.error("[ERROR] Server is not running on localhost:5000")
     except Exception as e:
-        print(f"[ERROR] Error: {e}")
+        log.error("[ERROR] Error: %s", e)
 
 def test_cache_check():
     """Check what's actually in the cache directory"""
-    import os
     cache_dir = "cache"
 
-    print(f"\nChecking cache directory: {cache_dir}")
+    log.info("\nChecking cache directory: %s", cache_dir)
     if os.path.exists(cache_dir):
-        files = [f for f in os.listdir(cache_dir) if f.endswith('.json')]
-        print(f"Cached proteins: {files}")
+        with os.scandir(cache_dir) as entries:
+            files = {entry.name for entry in entries if entry.name.endswith('.json')}
+        log.info("Cached proteins: %s", sorted(files))
 
         if "ATXN3.json" in files:
-            print("[X] ATXN3.json exists in cache")
+            log.warning("[X] ATXN3.json exists in cache")
         else:
-            print("[OK] ATXN3.json does NOT exist in cache")
+            log.info("[OK] ATXN3.json does NOT exist in cache")
     else:
-        print("[ERROR] Cache directory doesn't exist")
+        log.error("[ERROR] Cache directory doesn't exist")
 
 if __name__ == "__main__":
     test_cache_check()
-    print("\n" + "="*60 + "\n")
+    log.info("\n%s\n", _H2)
     test_query_endpoint()
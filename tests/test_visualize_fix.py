@@ -3,105 +3,163 @@
 Test that the visualization endpoint works with database-only data
 """
 
-import requests
+import asyncio
+import functools
+import httpx
 import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import utils.protein_database as pdb
+from helpers import get_logger, server_is_up
+
 BASE_URL = "http://localhost:5000"
+_H1 = "=" * 80  # Banner rule, built once
+CACHE_DIR = Path("cache")
+# Fail fast when nothing is listening, but give the server time to answer
+_CONNECT_TIMEOUT = 0.25
+_READ_TIMEOUT = 10
 
-def test_visualize_from_database():
-    """Test that /api/visualize works when only database data exists."""
+log = get_logger(__name__)
 
-    print("\n" + "="*80)
-    print("TEST: Visualize from Database (No Old Cache)")
-    print("="*80)
 
-    protein = "ATXN3"
+@functools.lru_cache(maxsize=32)
+def database_interactions(protein):
+    """Interactions stored for a protein; the database is not modified during a run."""
+    return tuple(pdb.get_all_interactions(protein))
 
-    # 1. Remove old cache file if it exists (to simulate database-only scenario)
-    old_cache = Path(f"cache/{protein}.json")
-    if old_cache.exists():
-        print(f"\n1. Removing old cache file to test database-only scenario...")
+
+def cache_path(protein):
+    """Path of the server's JSON cache file for a protein."""
+    return CACHE_DIR / f"{protein}.json"
+
+
+def remove_old_cache(protein):
+    """
+    Removes cache/<protein>.json so the server has to fall back to the database.
+
+    Returns:
+        (cache_path, removed) - removed is False if there was no file to delete
+    """
+    old_cache = cache_path(protein)  # Built once; callers reuse the returned path
+    # A single unlink; a missing file is the database-only case already
+    try:
         old_cache.unlink()
-        print(f"   Removed: {old_cache}")
-    else:
-        print(f"\n1. Old cache file doesn't exist (good for testing!)")
+        return old_cache, True
+    except FileNotFoundError:
+        return old_cache, False
+
+
+async def fetch_visualization(client: httpx.AsyncClient, protein):
+    """
+    Requests /api/visualize/<protein> without downloading a successful body.
+
+    The graph payload can be large and the tests only need the status code,
+    so the body is read only when it is needed to explain a failure.
+
+    Returns:
+        (status_code, body) - body is "" for a 200 response
+    """
+    async with client.stream("GET", f"/api/visualize/{protein}") as response:
+        if response.status_code == 200:
+            return response.status_code, ""
+        await response.aread()
+        return response.status_code, response.text
 
+
+async def check_visualize_from_database(client: httpx.AsyncClient, protein="ATXN3"):
+    """Test that /api/visualize works when only database data exists."""
+
+    log.info("\n%s", _H1)
+    log.info("TEST: Visualize from Database (No Old Cache) - %s", protein)
+    log.info(_H1)
+
+    # 1. Remove old cache file if it exists (to simulate database-only scenario)
     # 2. Verify database has data
-    import protein_database as pdb
-    interactions = pdb.get_all_interactions(protein)
-    print(f"\n2. Database check:")
-    print(f"   Interactions in database: {len(interactions)}")
+    # Both are independent blocking I/O, so they run together off the event loop
+    (old_cache, removed), interactions = await asyncio.gather(
+        asyncio.to_thread(remove_old_cache, protein),
+        asyncio.to_thread(database_interactions, protein)
+    )
+
+    if removed:
+        log.info("\n1. Removed old cache file to test database-only scenario...")
+        log.info("   Removed: %s", old_cache)
+    else:
+        log.info("\n1. Old cache file doesn't exist (good for testing!)")
+
+    log.info("\n2. Database check:")
+    log.info("   Interactions in database: %s", len(interactions))
 
     if not interactions:
-        print(f"   [ERROR] Database has no data for {protein}!")
-        print(f"   Run migration first: python migrate_cache.py --yes")
+        log.error("   [ERROR] Database has no data for %s!", protein)
+        log.error("   Run migration first: python migrate_cache.py --yes")
         return False
 
     # 3. Try to visualize (should create cache from database)
-    print(f"\n3. Requesting visualization...")
+    log.info("\n3. Requesting visualization...")
 
     try:
-        response = requests.get(f"{BASE_URL}/api/visualize/{protein}")
+        status, body = await fetch_visualization(client, protein)
 
-        if response.status_code == 200:
-            print(f"   Status: {response.status_code} OK")
-            print(f"   [SUCCESS] Visualization loaded!")
+        if status == 200:
+            log.info("   Status: %s OK", status)
+            log.info("   [SUCCESS] Visualization loaded!")
 
             # Check if cache file was created
-            if old_cache.exists():
+            try:
                 size = old_cache.stat().st_size
-                print(f"\n4. Cache file created from database:")
-                print(f"   File: {old_cache}")
-                print(f"   Size: {size:,} bytes")
-                print(f"   [OK] Database-to-cache conversion works!")
+            except FileNotFoundError:
+                log.warning("\n4. [WARNING] Cache file not created")
             else:
-                print(f"\n4. [WARNING] Cache file not created")
+                log.info("\n4. Cache file created from database:")
+                log.info("   File: %s", old_cache)
+                log.info("   Size: %s bytes", format(size, ","))
+                log.info("   [OK] Database-to-cache conversion works!")
 
             return True
 
-        elif response.status_code == 404:
-            print(f"   Status: {response.status_code} NOT FOUND")
-            print(f"   Response: {response.text}")
-            print(f"\n   [FAIL] Still getting 'Result not found' error!")
-            print(f"   The fix didn't work.")
+        elif status == 404:
+            log.error("   Status: %s NOT FOUND", status)
+            log.error("   Response: %s", body)
+            log.error("\n   [FAIL] Still getting 'Result not found' error!")
+            log.error("   The fix didn't work.")
             return False
 
         else:
-            print(f"   Status: {response.status_code}")
-            print(f"   Response: {response.text[:200]}")
+            log.error("   Status: %s", status)
+            log.error("   Response: %s", body[:200])
             return False
 
-    except requests.exceptions.ConnectionError:
-        print(f"\n   [ERROR] Could not connect to Flask server!")
-        print(f"   Start the server with: python app.py")
+    except httpx.ConnectError:
+        log.error("\n   [ERROR] Could not connect to Flask server!")
+        log.error("   Start the server with: python app.py")
         return False
 
     except Exception as e:
-        print(f"\n   [ERROR] Test failed: {e}")
+        log.error("\n   [ERROR] Test failed: %s", e)
         return False
 
 
-def test_full_instant_query_flow():
+async def check_full_instant_query_flow(client: httpx.AsyncClient, protein="VCP"):
     """Test complete flow: query → instant → visualize."""
 
-    print("\n" + "="*80)
-    print("TEST: Complete Instant Query Flow")
-    print("="*80)
-
-    protein = "VCP"
+    log.info("\n%s", _H1)
+    log.info("TEST: Complete Instant Query Flow - %s", protein)
+    log.info(_H1)
 
     # Remove old cache to force database-only scenario
-    old_cache = Path(f"cache/{protein}.json")
-    if old_cache.exists():
-        old_cache.unlink()
-        print(f"Removed old cache: {old_cache}")
+    old_cache, removed = remove_old_cache(protein)
+    if removed:
+        log.info("Removed old cache: %s", old_cache)
 
     try:
         # Step 1: Query
-        print(f"\n1. Querying {protein}...")
-        query_response = requests.post(
-            f"{BASE_URL}/api/query",
+        log.info("\n1. Querying %s...", protein)
+        query_response = await client.post(
+            "/api/query",
             json={"protein": protein}
         )
 
@@ -109,67 +167,112 @@ def test_full_instant_query_flow():
         status = query_data.get("status")
         source = query_data.get("source")
 
-        print(f"   Status: {status}")
-        print(f"   Source: {source}")
+        log.info("   Status: %s", status)
+        log.info("   Source: %s", source)
 
         if status != "complete":
-            print(f"   [FAIL] Expected 'complete', got '{status}'")
+            log.error("   [FAIL] Expected 'complete', got '%s'", status)
             return False
 
-        # Step 2: Visualize
-        print(f"\n2. Loading visualization...")
-        viz_response = requests.get(f"{BASE_URL}/api/visualize/{protein}")
+        # Step 2: Visualize (depends on the query having completed)
+        log.info("\n2. Loading visualization...")
+        viz_status, _ = await fetch_visualization(client, protein)
 
-        if viz_response.status_code == 200:
-            print(f"   Status: 200 OK")
-            print(f"   [SUCCESS] Complete flow works!")
+        if viz_status == 200:
+            log.info("   Status: 200 OK")
+            log.info("   [SUCCESS] Complete flow works!")
 
             # Check cache created
             if old_cache.exists():
-                print(f"\n3. Cache file created: {old_cache}")
-                print(f"   [OK] End-to-end instant query works!")
+                log.info("\n3. Cache file created: %s", old_cache)
+                log.info("   [OK] End-to-end instant query works!")
                 return True
 
         else:
-            print(f"   Status: {viz_response.status_code}")
-            print(f"   [FAIL] Visualization failed!")
+            log.error("   Status: %s", viz_status)
+            log.error("   [FAIL] Visualization failed!")
             return False
 
     except Exception as e:
-        print(f"   [ERROR] {e}")
+        log.error("   [ERROR] %s", e)
         return False
 
 
+# (check, protein) cases; add proteins here rather than copying a check.
+# The checks take the shared client, so they are named check_* to keep
+# pytest from collecting them; run this file as a script.
+TEST_CASES = [
+    (check_visualize_from_database, "ATXN3"),  # Visualize from database only
+    (check_full_instant_query_flow, "VCP"),    # Complete flow
+]
+
+
+async def run_tests(proteins=None):
+    """
+    Runs the test cases concurrently over one pooled async client.
+
+    Each case only touches its own protein's cache file, so runs given
+    disjoint proteins can execute in parallel processes without interfering.
+
+    Args:
+        proteins: Only run cases for these proteins (all cases if empty/None)
+    """
+    cases = [(test, protein) for test, protein in TEST_CASES if not proteins or protein in proteins]
+    if not server_is_up(BASE_URL):
+        log.error("\n[ERROR] Could not connect to Flask server at %s!", BASE_URL)
+        log.error("Start the server with: python app.py")
+        return [False] * len(cases)
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=httpx.Timeout(_READ_TIMEOUT, connect=_CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=4)
+    ) as client:
+        # Cases are independent, so they overlap; TEST_CONCURRENCY=1 runs them
+        # one at a time (single-worker server, or to keep the output unmixed)
+        semaphore = asyncio.Semaphore(max(1, int(os.getenv("TEST_CONCURRENCY", "2"))))
+
+        async def run_case(test, protein):
+            async with semaphore:
+                return await test(client, protein)
+
+        results = await asyncio.gather(
+            *(run_case(test, protein) for test, protein in cases),
+            return_exceptions=True
+        )
+
+    for (test, protein), result in zip(cases, results):
+        if isinstance(result, Exception):
+            log.error("\n[ERROR] %s(%s) raised: %s", test.__name__, protein, result)
+    return [result is True for result in results]
+
+
 if __name__ == "__main__":
-    print("\n" + "="*80)
-    print("VISUALIZATION FIX TEST SUITE")
-    print("="*80)
-    print("\nMake sure Flask server is running:")
-    print("  python app.py")
-    print("\n" + "="*80)
+    log.info("\n%s", _H1)
+    log.info("VISUALIZATION FIX TEST SUITE")
+    log.info(_H1)
+    log.info("\nMake sure Flask server is running:")
+    log.info("  python app.py")
+    log.info("\nRun a subset (e.g. one process per protein): python tests/test_visualize_fix.py ATXN3")
+    log.info("\n%s", _H1)
 
     try:
-        # Test 1: Visualize from database only
-        success1 = test_visualize_from_database()
-
-        # Test 2: Complete flow
-        success2 = test_full_instant_query_flow()
-
-        print("\n" + "="*80)
-        if success1 and success2:
-            print("ALL TESTS PASSED!")
-            print("="*80)
-            print("\nThe fix works! You can now:")
-            print("  1. Query proteins in database → Instant load")
-            print("  2. Visualize immediately (no 'Result not found')")
-            print("  3. Cache created automatically from database")
+        results = asyncio.run(run_tests(set(sys.argv[1:])))
+
+        log.info("\n%s", _H1)
+        if all(results):
+            log.info("ALL TESTS PASSED!")
+            log.info(_H1)
+            log.info("\nThe fix works! You can now:")
+            log.info("  1. Query proteins in database → Instant load")
+            log.info("  2. Visualize immediately (no 'Result not found')")
+            log.info("  3. Cache created automatically from database")
         else:
-            print("SOME TESTS FAILED")
-            print("="*80)
-            print("\nCheck the errors above.")
+            log.error("SOME TESTS FAILED")
+            log.info(_H1)
+            log.info("\nCheck the errors above.")
 
-        print("\n" + "="*80 + "\n")
+        log.info("\n%s\n", _H1)
 
     except Exception as e:
-        print(f"\n[ERROR] Test suite failed: {e}")
-        print("\n" + "="*80 + "\n")
+        log.error("\n[ERROR] Test suite failed: %s", e)
+        log.info("\n%s\n", _H1)
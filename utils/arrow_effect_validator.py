@@ -12,14 +12,19 @@ Ensures:
 - No double-negative issues (e.g., "inhibits Apoptosis Inhibition" → "activates Apoptosis Inhibition")
 - Logical biological consequence chains
 
-Processes 3-4 interactions in parallel for efficiency.
+Validates interactions in batches (one Gemini call per ARROW_VALIDATOR_BATCH_SIZE
+interactions, default 6), concurrently on one asyncio event loop
+(ARROW_VALIDATOR_CONCURRENCY requests in flight, default 16).
 """
 
 import os
 import json
 import re
-from typing import Dict, List, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import functools
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
 
 # Check if Gemini is available
 try:
@@ -36,18 +41,51 @@ MAX_THINKING_TOKENS = 32768  # Generous thinking budget for complex validation
 MAX_OUTPUT_TOKENS = 8192     # Sufficient for corrections JSON
 TEMPERATURE = 0.2            # Deterministic corrections
 TOP_P = 0.90
-MAX_WORKERS = 4              # Parallel validation workers
+# Concurrent Gemini requests per payload. Each thinking call takes ~30-60 s,
+# so 16 in flight is roughly 16-32 requests/minute: within paid-tier
+# gemini-2.5-pro RPM quotas. Lower it (e.g. to 2) on the free tier.
+DEFAULT_MAX_WORKERS = int(os.getenv("ARROW_VALIDATOR_CONCURRENCY", "16"))
+# Interactions per Gemini call; each chunk is one request
+DEFAULT_BATCH_SIZE = int(os.getenv("ARROW_VALIDATOR_BATCH_SIZE", "6"))
+
+# Gemini corrections are cached on disk keyed by the exact prompt, so re-runs
+# over unchanged interactions skip the API call entirely
+VALIDATION_CACHE_DIR = Path(os.getenv(
+    "ARROW_VALIDATOR_CACHE_DIR",
+    Path.home() / ".cache" / "arrow_validator"
+))
+
+# A bare {} answer (optionally fenced): Gemini found nothing to correct
+EMPTY_CORRECTIONS_RESPONSE = re.compile(r'\s*(```json)?\s*\{\s*\}\s*(```)?\s*')
 
 # Valid values reference
 VALID_DIRECTIONS = ["main_to_primary", "primary_to_main", "bidirectional"]
 VALID_ARROWS = ["activates", "inhibits", "binds", "regulates", "complex"]
 VALID_INTERACTION_TYPES = ["direct", "indirect"]
 
+# Function names that already describe a negative effect ("inhibits X Inhibition" is a double negative)
+NEGATIVE_FUNCTION_TERMS = re.compile(
+    r'\b(inhibition|suppression|repression|prevention|blockade|downregulation)\b', re.I
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key: str) -> "google_genai.Client":
+    """
+    Returns a shared Gemini client per API key.
+
+    Reusing one client keeps its HTTP connection pool (and TLS sessions) warm
+    across every validation call instead of handshaking per request.
+    """
+    return google_genai.Client(api_key=api_key)
+
 
 def validate_arrows_and_effects(
     payload: Dict[str, Any],
     api_key: str,
-    verbose: bool = False
+    verbose: bool = False,
+    max_workers: Optional[int] = None,
+    batch_size: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Main entry point: validates all interactions in the payload.
@@ -56,6 +94,8 @@ def validate_arrows_and_effects(
         payload: Full pipeline payload with snapshot_json and ctx_json
         api_key: Google AI API key
         verbose: Enable detailed logging
+        max_workers: Concurrent Gemini requests (default: DEFAULT_MAX_WORKERS)
+        batch_size: Interactions per Gemini request (default: DEFAULT_BATCH_SIZE)
 
     Returns:
         Updated payload with corrected arrows/directions/effects
@@ -85,40 +125,20 @@ def validate_arrows_and_effects(
         print(f"ARROW VALIDATION: {main_protein} ({len(interactors)} interactions)")
         print(f"{'='*60}")
 
-    # Determine worker count (max 4 concurrent workers)
-    worker_count = max(1, min(MAX_WORKERS, len(interactors)))
-
-    # Validate interactions in parallel
-    corrected_interactors = []
-    with ThreadPoolExecutor(max_workers=worker_count) as executor:
-        # Submit all tasks
-        future_to_idx = {
-            executor.submit(
-                validate_single_interaction,
-                interactor,
-                main_protein,
-                api_key,
-                verbose
-            ): idx
-            for idx, interactor in enumerate(interactors)
-        }
-
-        # Collect results as they complete
-        results = [None] * len(interactors)
-        for future in as_completed(future_to_idx):
-            idx = future_to_idx[future]
-            try:
-                corrected = future.result()
-                results[idx] = corrected
-                if verbose:
-                    partner = corrected.get("primary", "UNKNOWN")
-                    print(f"  ✓ Validated {main_protein} ↔ {partner}")
-            except Exception as exc:
-                partner = interactors[idx].get("primary", "UNKNOWN")
-                print(f"  ✗ Error validating {main_protein} ↔ {partner}: {exc}")
-                results[idx] = interactors[idx]  # Keep original on error
+    # Never more requests in flight than there are batches
+    batch_size = max(1, batch_size or DEFAULT_BATCH_SIZE)
+    batch_count = -(-len(interactors) // batch_size)
+    worker_count = max(1, min(max_workers or DEFAULT_MAX_WORKERS, batch_count))
 
-        corrected_interactors = [r for r in results if r is not None]
+    # Validate batches concurrently on one event loop
+    corrected_interactors = asyncio.run(_validate_interactors_async(
+        interactors,
+        main_protein,
+        api_key,
+        worker_count,
+        batch_size,
+        verbose
+    ))
 
     # Update payload
     snapshot["interactors"] = corrected_interactors
@@ -132,11 +152,226 @@ def validate_arrows_and_effects(
     return payload
 
 
+def _cache_key(prompt: str) -> str:
+    """
+    Content hash of one interaction's validation input.
+
+    Keyed by its single-interaction prompt, which fully describes the
+    interaction. Batch answers are stored under the same key: the batch
+    prompt embeds each interaction's single prompt verbatim.
+    """
+    return hashlib.sha256(f"gemini-2.5-pro\n{prompt}".encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_cached_corrections(key: str) -> str:
+    """
+    In-process layer over the disk cache.
+
+    Raises FileNotFoundError on a miss, which lru_cache does not memoize, so
+    entries written later in the run are still picked up.
+    """
+    return (VALIDATION_CACHE_DIR / f"{key}.json").read_text(encoding="utf-8")
+
+
+def load_cached_corrections(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Loads cached Gemini corrections for a validation request.
+
+    Args:
+        key: Content hash from _cache_key
+
+    Returns:
+        Corrections dict ({} if nothing needed correcting), or None on a miss
+    """
+    try:
+        return json.loads(_read_cached_corrections(key))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] Ignoring unreadable arrow validation cache entry {key}: {e}")
+        return None
+
+
+def store_cached_corrections(key: str, response, corrections: Optional[Dict[str, Any]]):
+    """
+    Caches the corrections parsed from a Gemini response.
+
+    parse_gemini_response returns None both for an explicit "{}" (nothing to
+    correct) and for unusable output; only the former is cached, as {}.
+
+    Args:
+        key: Content hash from _cache_key
+        response: Gemini API response the corrections came from
+        corrections: parse_gemini_response(response)
+    """
+    if corrections is None:
+        text = getattr(response, "text", "") or ""
+        if not EMPTY_CORRECTIONS_RESPONSE.fullmatch(text):
+            return
+        corrections = {}
+
+    # Atomic write so an interrupted run never leaves a truncated entry
+    cache_path = VALIDATION_CACHE_DIR / f"{key}.json"
+    tmp_path = cache_path.with_suffix(".json.tmp")
+    try:
+        VALIDATION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(corrections, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[WARNING] Failed to write arrow validation cache entry {key}: {e}")
+
+
+async def _validate_interactors_async(
+    interactors: List[Dict[str, Any]],
+    main_protein: str,
+    api_key: str,
+    worker_count: int,
+    batch_size: int,
+    verbose: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Validates interactors in batches of batch_size, one Gemini call per batch,
+    with at most worker_count calls in flight.
+
+    Returns:
+        Corrected interactors in input order (the original on error)
+    """
+    # One client shared by every request; it is per event loop because its
+    # async transport cannot outlive the loop
+    client = google_genai.Client(api_key=api_key)
+    semaphore = asyncio.Semaphore(worker_count)
+    chunks = [interactors[start:start + batch_size] for start in range(0, len(interactors), batch_size)]
+
+    async def bounded(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await validate_interactions_batch_async(
+                chunk, [main_protein] * len(chunk), client, verbose
+            )
+
+    try:
+        chunk_results = await asyncio.gather(*(bounded(chunk) for chunk in chunks), return_exceptions=True)
+    finally:
+        # Release the connection pool before the loop closes
+        await client.aio.aclose()
+
+    corrected_interactors = []
+    for chunk, result in zip(chunks, chunk_results):
+        if isinstance(result, Exception):
+            for interactor in chunk:
+                partner = interactor.get("primary", "UNKNOWN")
+                print(f"  ✗ Error validating {main_protein} ↔ {partner}: {result}")
+            corrected_interactors.extend(chunk)  # Keep originals on error
+            continue
+        if verbose:
+            for corrected in result:
+                print(f"  ✓ Validated {main_protein} ↔ {corrected.get('primary', 'UNKNOWN')}")
+        corrected_interactors.extend(result)
+
+    return corrected_interactors
+
+
+@functools.lru_cache(maxsize=1)
+def _single_validation_config() -> "types.GenerateContentConfig":
+    """Generation config for validating one interaction (built once, never mutated)."""
+    return types.GenerateContentConfig(
+        thinking_config=types.ThinkingConfig(
+            thinking_budget=MAX_THINKING_TOKENS,
+            include_thoughts=True,
+        ),
+        tools=[types.Tool(google_search=types.GoogleSearch())],
+        max_output_tokens=MAX_OUTPUT_TOKENS,
+        temperature=TEMPERATURE,
+        top_p=TOP_P,
+    )
+
+
+def _local_fix_double_negatives(
+    interactor: Dict[str, Any],
+    main_protein: str,
+    verbose: bool = False
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Applies the double-negative rule (section 4 of the prompt) without Gemini.
+
+    A function whose name contains a negative term and whose arrow is
+    "inhibits" is rewritten to "activates" (inhibiting an inhibitor is
+    activation). The fix is only applied when it is the whole job: a direct
+    interaction with valid arrows and direction everywhere and function
+    effects/directions that agree with them. Anything else is left untouched
+    for Gemini, which applies the same rule as part of its full check.
+
+    Args:
+        interactor: Interaction data for one partner protein
+        main_protein: Query protein symbol
+        verbose: Enable detailed logging
+
+    Returns:
+        (interactor, needs_llm): the corrected interactor and False if it was
+        fixed locally, otherwise the unchanged interactor and True
+    """
+    effect_map = {
+        "activates": "activation",
+        "inhibits": "inhibition",
+        "binds": "binding",
+        "regulates": "regulation",
+        "complex": "complex formation"
+    }
+
+    fixes = []
+    for func in interactor.get("functions", []):
+        func_name = func.get("function", "")
+        if func.get("arrow") != "inhibits" or not NEGATIVE_FUNCTION_TERMS.search(func_name):
+            continue
+        changes = {"arrow": "activates"}
+        # Effect labels that mirrored the old arrow follow it
+        for field in ("interaction_effect", "function_effect"):
+            if func.get(field) == "inhibits":
+                changes[field] = "activates"
+            elif func.get(field) == "inhibition":
+                changes[field] = "activation"
+        fixes.append({
+            "function": func_name,
+            "corrections": changes,
+            "reasoning": "Double negative: inhibiting a negative function is activation"
+        })
+
+    if not fixes:
+        return interactor, True
+
+    # Anything beyond the lexical rule still needs Gemini's judgement
+    direction = interactor.get("direction")
+    if (
+        interactor.get("interaction_type", "direct") != "direct"
+        or interactor.get("arrow") not in VALID_ARROWS
+        or direction not in VALID_DIRECTIONS
+    ):
+        return interactor, True
+
+    changes_by_name = {fix["function"]: fix["corrections"] for fix in fixes}
+    for func in interactor.get("functions", []):
+        fixed = {**func, **changes_by_name.get(func.get("function", ""), {})}
+        func_arrow = fixed.get("arrow")
+        if func_arrow not in VALID_ARROWS:
+            return interactor, True
+        if fixed.get("interaction_effect") not in (None, "", func_arrow, effect_map[func_arrow]):
+            return interactor, True
+        if fixed.get("interaction_direction") not in (None, "", direction):
+            return interactor, True
+
+    if verbose:
+        partner = interactor.get("primary", "UNKNOWN")
+        print(f"    → Fixed {len(fixes)} double negative(s) locally for {partner}, skipping Gemini")
+
+    return apply_corrections(interactor, {"functions": fixes}, main_protein, verbose), False
+
+
 def validate_single_interaction(
     interactor: Dict[str, Any],
     main_protein: str,
     api_key: str,
-    verbose: bool = False
+    verbose: bool = False,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     Validates a single protein-protein interaction using Gemini.
@@ -146,38 +381,41 @@ def validate_single_interaction(
         main_protein: Query protein symbol
         api_key: Google AI API key
         verbose: Enable detailed logging
+        use_cache: Reuse/store corrections in VALIDATION_CACHE_DIR
 
     Returns:
         Corrected interactor data
     """
     partner = interactor.get("primary", "UNKNOWN")
 
+    interactor, needs_llm = _local_fix_double_negatives(interactor, main_protein, verbose)
+    if not needs_llm:
+        return interactor
+
     try:
         # Build validation prompt
         prompt = build_validation_prompt(interactor, main_protein)
 
-        # Call Gemini with thinking mode + Google Search
-        client = google_genai.Client(api_key=api_key)
-
-        config = types.GenerateContentConfig(
-            thinking_config=types.ThinkingConfig(
-                thinking_budget=MAX_THINKING_TOKENS,
-                include_thoughts=True,
-            ),
-            tools=[types.Tool(google_search=types.GoogleSearch())],
-            max_output_tokens=MAX_OUTPUT_TOKENS,
-            temperature=TEMPERATURE,
-            top_p=TOP_P,
-        )
+        key = _cache_key(prompt)
+        corrections = load_cached_corrections(key) if use_cache else None
 
-        response = client.models.generate_content(
-            model="gemini-2.5-pro",
-            contents=prompt,
-            config=config,
-        )
+        if corrections is not None:
+            if verbose:
+                print(f"    → Using cached validation for {partner}")
+        else:
+            # Call Gemini with thinking mode + Google Search
+            client = _get_client(api_key)
+
+            response = client.models.generate_content(
+                model="gemini-2.5-pro",
+                contents=prompt,
+                config=_single_validation_config(),
+            )
 
-        # Parse corrections from response
-        corrections = parse_gemini_response(response)
+            # Parse corrections from response
+            corrections = parse_gemini_response(response)
+            if use_cache:
+                store_cached_corrections(key, response, corrections)
 
         # Apply corrections to interactor
         if corrections:
@@ -192,6 +430,245 @@ def validate_single_interaction(
         return interactor  # Return original on error
 
 
+async def validate_single_interaction_async(
+    interactor: Dict[str, Any],
+    main_protein: str,
+    client: "google_genai.Client",
+    config: "types.GenerateContentConfig",
+    verbose: bool = False,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Async variant of validate_single_interaction.
+
+    Args:
+        interactor: Interaction data for one partner protein
+        main_protein: Query protein symbol
+        client: Gemini client created on the running event loop
+        config: Generation config shared by the run
+        verbose: Enable detailed logging
+        use_cache: Reuse/store corrections in VALIDATION_CACHE_DIR
+
+    Returns:
+        Corrected interactor data
+    """
+    partner = interactor.get("primary", "UNKNOWN")
+
+    interactor, needs_llm = _local_fix_double_negatives(interactor, main_protein, verbose)
+    if not needs_llm:
+        return interactor
+
+    try:
+        prompt = build_validation_prompt(interactor, main_protein)
+        key = _cache_key(prompt)
+        corrections = load_cached_corrections(key) if use_cache else None
+
+        if corrections is not None:
+            if verbose:
+                print(f"    → Using cached validation for {partner}")
+        else:
+            response = await client.aio.models.generate_content(
+                model="gemini-2.5-pro",
+                contents=prompt,
+                config=config,
+            )
+
+            corrections = parse_gemini_response(response)
+            if use_cache:
+                store_cached_corrections(key, response, corrections)
+
+        if corrections:
+            interactor = apply_corrections(interactor, corrections, main_protein, verbose)
+            if verbose:
+                print(f"    → Applied {len(corrections)} correction(s) to {partner}")
+
+        return interactor
+
+    except Exception as e:
+        print(f"[ERROR] Failed to validate {main_protein} ↔ {partner}: {e}")
+        return interactor  # Return original on error
+
+
+async def validate_interactions_batch_async(
+    interactors: List[Dict[str, Any]],
+    main_proteins: List[str],
+    client: "google_genai.Client",
+    verbose: bool = False,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Validates several interactions with one Gemini call.
+
+    The interactions are marshalled into a single prompt (stable index per
+    interaction) and Gemini answers with a JSON object of corrections keyed by
+    that index. If the call or its parsing fails, the batch falls back to one
+    call per interaction. Uses the google-genai async client, so many batches
+    can be in flight on one event loop without a thread per request. Interactions fixed by the
+    local double-negative rule or with cached corrections are resolved
+    locally; only the rest are sent to Gemini, and their per-interaction
+    corrections are cached in turn.
+
+    Args:
+        interactors: Interaction data for each partner protein
+        main_proteins: Query protein symbol for each interactor (same order)
+        client: Gemini client created on the running event loop (its async
+            transport cannot outlive the loop; the caller closes it)
+        verbose: Enable detailed logging
+        use_cache: Reuse/store corrections in VALIDATION_CACHE_DIR
+
+    Returns:
+        Corrected interactor data, in input order
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(interactors)
+    keys: List[Optional[str]] = [None] * len(interactors)
+    pending = []
+    for idx, (interactor, main_protein) in enumerate(zip(interactors, main_proteins)):
+        interactor, needs_llm = _local_fix_double_negatives(interactor, main_protein, verbose)
+        if not needs_llm:
+            results[idx] = interactor
+            continue
+        if use_cache:
+            keys[idx] = _cache_key(build_validation_prompt(interactor, main_protein))
+            corrections = load_cached_corrections(keys[idx])
+            if corrections is not None:
+                if verbose:
+                    print(f"    → Using cached validation for {interactor.get('primary', 'UNKNOWN')}")
+                if corrections:
+                    interactor = apply_corrections(interactor, corrections, main_protein, verbose)
+                results[idx] = interactor
+                continue
+        pending.append(idx)
+
+    batch = [interactors[idx] for idx in pending]
+    batch_mains = [main_proteins[idx] for idx in pending]
+
+    if len(batch) == 1:
+        results[pending[0]] = await validate_single_interaction_async(
+            batch[0], batch_mains[0], client, _single_validation_config(), verbose, use_cache
+        )
+    elif batch:
+        try:
+            response = await client.aio.models.generate_content(
+                model="gemini-2.5-pro",
+                contents=build_batch_validation_prompt(batch, batch_mains),
+                config=_batch_validation_config(len(batch)),
+            )
+            corrected = _apply_batch_response(
+                batch, batch_mains, response, verbose,
+                cache_keys=[keys[idx] for idx in pending] if use_cache else None
+            )
+
+        except Exception as e:
+            print(f"[WARNING] Batch validation failed ({len(batch)} interactions), falling back to single calls: {e}")
+            corrected = [
+                await validate_single_interaction_async(
+                    interactor, main_protein, client, _single_validation_config(), verbose, use_cache
+                )
+                for interactor, main_protein in zip(batch, batch_mains)
+            ]
+
+        for idx, interactor in zip(pending, corrected):
+            results[idx] = interactor
+
+    return results
+
+
+@functools.lru_cache(maxsize=16)
+def _batch_validation_config(batch_len: int) -> "types.GenerateContentConfig":
+    """Generation config for a batch call; output budget grows with the batch."""
+    return types.GenerateContentConfig(
+        thinking_config=types.ThinkingConfig(
+            thinking_budget=MAX_THINKING_TOKENS,
+            include_thoughts=True,
+        ),
+        tools=[types.Tool(google_search=types.GoogleSearch())],
+        max_output_tokens=min(MAX_OUTPUT_TOKENS * batch_len, 65536),
+        temperature=TEMPERATURE,
+        top_p=TOP_P,
+    )
+
+
+def _apply_batch_response(
+    interactors: List[Dict[str, Any]],
+    main_proteins: List[str],
+    response,
+    verbose: bool = False,
+    cache_keys: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Maps an index-keyed batch response back onto its interactors.
+
+    When cache_keys (one _cache_key per interactor) are given, every
+    interaction the response answered, including explicit {} answers, is
+    stored in the corrections cache.
+
+    Raises:
+        ValueError: If the response is neither corrections JSON nor an explicit {}
+            (e.g. truncated output), so the caller falls back to single calls
+    """
+    batch_corrections = parse_gemini_response(response)
+    if batch_corrections is None:
+        # Either nothing to correct or unparseable: only a bare {} means the former
+        text = getattr(response, "text", "") or ""
+        if not EMPTY_CORRECTIONS_RESPONSE.fullmatch(text):
+            raise ValueError("no parseable corrections JSON in batch response")
+        batch_corrections = {}
+
+    results = []
+    for idx, (interactor, main_protein) in enumerate(zip(interactors, main_proteins)):
+        corrections = batch_corrections.get(str(idx)) or batch_corrections.get(idx)
+        if cache_keys is not None and str(idx) in batch_corrections and isinstance(corrections or {}, dict):
+            store_cached_corrections(cache_keys[idx], response, corrections or {})
+        if corrections:
+            interactor = apply_corrections(interactor, corrections, main_protein, verbose)
+            if verbose:
+                partner = interactor.get("primary", "UNKNOWN")
+                print(f"    → Applied {len(corrections)} correction(s) to {partner}")
+        results.append(interactor)
+    return results
+
+
+def build_batch_validation_prompt(interactors: List[Dict[str, Any]], main_proteins: List[str]) -> str:
+    """
+    Builds one prompt that validates several interactions at once.
+
+    Each interaction keeps its full single-interaction prompt, labeled with a stable index.
+
+    Args:
+        interactors: Interaction data for each partner protein
+        main_proteins: Query protein symbol for each interactor
+
+    Returns:
+        Formatted prompt string
+    """
+    sections = []
+    for idx, (interactor, main_protein) in enumerate(zip(interactors, main_proteins)):
+        single = build_validation_prompt(interactor, main_protein)
+        single = single.rsplit("Begin validation:", 1)[0].rstrip()
+        sections.append(f"### INTERACTION {idx}\n\n{single}")
+    body = "\n\n".join(sections)
+
+    return f"""You will validate {len(interactors)} INDEPENDENT protein interactions.
+Each one is introduced by "### INTERACTION <index>" and carries its own instructions;
+apply them to that interaction only.
+
+**BATCH OUTPUT FORMAT:**
+Return ONE JSON object whose keys are the interaction indices (as strings) and whose
+values are that interaction's corrections object in the OUTPUT FORMAT given in its
+section. Use {{}} for interactions that need no corrections. Example:
+
+```json
+{{
+  "0": {{"interaction_level": {{"arrow": "inhibits"}}, "functions": []}},
+  "1": {{}}
+}}
+```
+
+{body}
+
+Begin validation:"""
+
+
 def build_validation_prompt(interactor: Dict[str, Any], main_protein: str) -> str:
     """
     Builds a detailed validation prompt for Gemini.